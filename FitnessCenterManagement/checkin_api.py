@@ -0,0 +1,105 @@
+# checkin_api.py
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Literal, Optional
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel
+from supabase import create_client, Client
+from modules.checkin_ingestor import CheckinIngestor, BufferFullError
+from modules.data_access import insert, upsert
+from modules.expiry_index import get_expiry_index
+
+#---------- 로컬에서 API 실행 ----------
+# cd 97-develop/FitnessCenterManagement
+# uvicorn checkin_api:app --port 8000
+
+load_dotenv()
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+# 종료할 때 DB에 저장하지 못한 출입 기록을 남겨 두는 파일 (다음 시작 때 다시 저장)
+SPOOL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".checkin_spool.json")
+
+
+def save_gym_logs(rows):
+    # log_id가 있는 행은 재시작 전에 퇴장 시간 없이 저장된 방문을 닫는 갱신.
+    # 갱신(upsert)은 다시 실행해도 같으므로 먼저 하고, 새 행 삽입은 마지막에 한다
+    closed = [r for r in rows if "log_id" in r]
+    new = [r for r in rows if "log_id" not in r]
+    if closed:
+        upsert(supabase, "gym_logs", closed)
+    if new:
+        insert(supabase, "gym_logs", new)
+
+
+def load_open_gym_logs(since):
+    return (
+        supabase.table("gym_logs")
+        .select("log_id, member_id, check_in_time")
+        .is_("check_out_time", "null")
+        .gte("check_in_time", since.isoformat())
+        .order("check_in_time")
+        .execute()
+        .data
+        or []
+    )
+
+
+ingestor = CheckinIngestor(save_gym_logs, load_open=load_open_gym_logs, spool_path=SPOOL_PATH)
+
+
+class CheckinEvent(BaseModel):
+    member_id: int
+    event: Literal["check_in", "check_out"]
+    timestamp: Optional[datetime] = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # 재시작 전에 입장한 회원을 복원해야 퇴장이 짝지어지고 현재 인원도 0으로 떨어지지 않는다
+    await ingestor.restore()
+    ingestor.start()
+    yield
+    await ingestor.stop()
+
+
+app = FastAPI(title="Gym check-in ingestion", lifespan=lifespan)
+
+
+@app.post("/events", status_code=202)
+async def ingest_events(events: list[CheckinEvent]):
+    # 메모리 버퍼에만 쌓고 바로 응답, DB 저장은 micro-batch flush가 담당
+    # 버퍼가 가득 차면 묶음 전체를 반영하지 않고 503 (그대로 재전송해도 안전)
+    try:
+        statuses = ingestor.record_many([(e.member_id, e.event, e.timestamp) for e in events])
+    except BufferFullError:
+        raise HTTPException(status_code=503, detail="ingest buffer is full, no events in this batch were recorded")
+    return {"accepted": len(statuses), "statuses": statuses}
+
+
+@app.post("/event", status_code=202)
+async def ingest_event(event: CheckinEvent):
+    return await ingest_events([event])
+
+
+@app.get("/stats")
+async def stats():
+    return ingestor.snapshot()
+
+
+@app.get("/occupancy")
+async def occupancy():
+    return ingestor.occupancy()
+
+
+@app.get("/members/expiring")
+async def expiring_members(days: int = Query(7, ge=0, le=365)):
+    # 재적재가 필요한 경우에만 DB를 읽으므로 스레드에서 실행
+    index = await asyncio.to_thread(get_expiry_index, supabase)
+    return index.expiring_within(days)
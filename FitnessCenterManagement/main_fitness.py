@@ -1,10 +1,6 @@
 # main_fitness.py
 import streamlit as st
-from supabase import create_client, Client
-from modules.member_trainer_management import manage_members, manage_trainers
-from modules.reservation_management import add_pt_reservation, get_trainer_schedule, manage_gym_logs
-from modules.emails_and_reports import send_email, generate_report
-import uuid
+# 메뉴별 모듈(pandas, plotly 등 포함)은 해당 메뉴를 열 때 import 한다
 # 환경변수
 import os
 from dotenv import load_dotenv
@@ -18,29 +14,43 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+@st.cache_resource
+def get_supabase():
+    # 클라이언트는 프로세스당 한 번만 만들고 모든 세션/재실행에서 재사용
+    from supabase import create_client
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+supabase = get_supabase()
 
 email_sender = os.getenv("GMAIL_EMAIL")
 email_password = os.getenv("GMAIL_APP_PASSWORD")
-smtp_server = os.getenv("SMTP_SERVER")
+smtp_server = os.getenv("SMTP_SERVER") or "smtp.gmail.com"
+smtp_port = int(os.getenv("SMTP_PORT") or 587)
 
 
 # 사이드바 메뉴
-menu = st.sidebar.selectbox("메뉴 선택", ["회원 및 트레이너 관리", "예약 및 출입 관리", "이메일 발송 및 통계"])
+menu = st.sidebar.selectbox("메뉴 선택", ["현황 대시보드", "회원 및 트레이너 관리", "예약 및 출입 관리", "이메일 발송 및 통계"])
 
 # 메뉴에 맞는 기능 호출
-if menu == "회원 및 트레이너 관리":
+if menu == "현황 대시보드":
+    from modules.dashboard import show_dashboard
+    st.header("현황 대시보드")
+    show_dashboard(supabase)
+
+elif menu == "회원 및 트레이너 관리":
+    from modules.member_trainer_management import manage_members, manage_trainers
     st.header("회원 및 트레이너 관리")
     manage_members(supabase)
     manage_trainers(supabase)
     
 elif menu == "예약 및 출입 관리":
+    from modules.reservation_management import manage_pt_reservations, manage_gym_logs
     st.header("예약 및 출입 관리")
-    add_pt_reservation(supabase)
-    get_trainer_schedule(supabase)
+    manage_pt_reservations(supabase)
     manage_gym_logs(supabase)
     
 elif menu == "이메일 발송 및 통계":
+    from modules.emails_and_reports import generate_report, send_expiry_reminders
     st.header("이메일 발송 및 통계")
-    send_email("recipient@example.com", "Test Subject", "Test Body", "your_email", "your_password")
+    send_expiry_reminders(supabase, email_sender, email_password, smtp_server, smtp_port)
     generate_report(supabase)
@@ -0,0 +1,157 @@
+# modules/bulk_import.py
+import time
+import streamlit as st
+from modules.data_access import upsert
+
+# 파일에서 한 번에 읽어 검증할 행 수
+IMPORT_CHUNK = 5000
+# Supabase 요청 1회당 upsert 행 수
+UPSERT_BATCH = 500
+PHONE_PATTERN = r"010\d{8}"
+MEMBER_REQUIRED = ["name", "phone", "membership_registration", "membership_expiration"]
+GYM_LOG_REQUIRED = ["member_id", "check_in_time", "check_out_time"]
+
+
+def read_chunks(file, filename, chunksize=IMPORT_CHUNK):
+    import pandas as pd  # 파일을 올렸을 때만 필요
+    # CSV는 chunksize로 스트리밍, Excel은 한 번 읽은 뒤 같은 크기로 나눈다
+    # 구형 .xls는 xlrd가 필요해 받지 않는다 (requirements에는 .xlsx용 openpyxl만 있음)
+    if filename.lower().endswith(".xlsx"):
+        df = pd.read_excel(file, dtype=str)
+        for i in range(0, len(df), chunksize):
+            yield df.iloc[i:i + chunksize]
+    else:
+        yield from pd.read_csv(file, dtype=str, chunksize=chunksize)
+
+
+def _check_columns(df, required):
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼 누락: {', '.join(missing)}")
+
+
+def _add_errors(errors, mask, message):
+    # 파일 기준 행 번호 (헤더 1행 + 1부터 시작)
+    errors.extend({"row": int(i) + 2, "error": message} for i in mask[mask].index)
+
+
+def _with_row_numbers(df):
+    return list(zip((int(i) + 2 for i in df.index), df.to_dict("records")))
+
+
+def validate_members(df):
+    import pandas as pd
+    _check_columns(df, MEMBER_REQUIRED)
+    errors = []
+    name = df["name"].fillna("").str.strip()
+    phone = df["phone"].fillna("").str.replace("-", "", regex=False).str.strip()
+    reg = pd.to_datetime(df["membership_registration"], errors="coerce", format="ISO8601")
+    exp = pd.to_datetime(df["membership_expiration"], errors="coerce", format="ISO8601")
+
+    bad_name = name == ""
+    bad_phone = ~phone.str.fullmatch(PHONE_PATTERN)
+    bad_date = reg.isna() | exp.isna()
+    bad_order = ~bad_date & (exp < reg)
+    _add_errors(errors, bad_name, "이름 없음")
+    _add_errors(errors, bad_phone, "전화번호 형식 오류 (010xxxxxxxx)")
+    _add_errors(errors, bad_date, "날짜 형식 오류")
+    _add_errors(errors, bad_order, "만료일이 등록일보다 빠름")
+    invalid = bad_name | bad_phone | bad_date | bad_order
+
+    # member_id 컬럼이 있으면 기존 회원 갱신(upsert), 없으면 신규 등록
+    if "member_id" in df.columns:
+        member_id = pd.to_numeric(df["member_id"], errors="coerce")
+        bad_member = member_id.isna()
+        _add_errors(errors, bad_member, "member_id 오류")
+        invalid |= bad_member
+
+    valid = ~invalid
+    out = pd.DataFrame({
+        "name": name[valid],
+        "phone": phone[valid],
+        "email": df["email"][valid].fillna("").str.strip() if "email" in df.columns else "",
+        "membership_registration": reg[valid].dt.strftime("%Y-%m-%d"),
+        "membership_expiration": exp[valid].dt.strftime("%Y-%m-%d"),
+        "membership_level": df["membership_level"][valid].fillna("실버")
+        if "membership_level" in df.columns else "실버",
+    })
+    if "member_id" in df.columns:
+        out["member_id"] = member_id[valid].astype("int64")
+    return _with_row_numbers(out.astype(object)), errors
+
+
+def validate_gym_logs(df):
+    import pandas as pd
+    _check_columns(df, GYM_LOG_REQUIRED)
+    errors = []
+    member_id = pd.to_numeric(df["member_id"], errors="coerce")
+    check_in = pd.to_datetime(df["check_in_time"], errors="coerce", format="ISO8601")
+    check_out = pd.to_datetime(df["check_out_time"], errors="coerce", format="ISO8601")
+
+    bad_member = member_id.isna()
+    bad_time = check_in.isna() | check_out.isna()
+    bad_order = ~bad_time & (check_out < check_in)
+    _add_errors(errors, bad_member, "member_id 오류")
+    _add_errors(errors, bad_time, "시간 형식 오류")
+    _add_errors(errors, bad_order, "퇴장 시간이 입장 시간보다 빠름")
+
+    valid = ~(bad_member | bad_time | bad_order)
+    out = pd.DataFrame({
+        "member_id": member_id[valid].astype("int64"),
+        "check_in_time": check_in[valid].dt.strftime("%Y-%m-%dT%H:%M:%S"),
+        "check_out_time": check_out[valid].dt.strftime("%Y-%m-%dT%H:%M:%S"),
+    })
+    return _with_row_numbers(out.astype(object)), errors
+
+
+def upsert_batches(supabase, table, rows, batch_size=UPSERT_BATCH):
+    # rows: (행 번호, 레코드) 목록. 실패한 배치만 한 행씩 다시 보내 오류 행을 찾는다
+    saved = 0
+    errors = []
+    for i in range(0, len(rows), batch_size):
+        batch = rows[i:i + batch_size]
+        try:
+            upsert(supabase, table, [record for _, record in batch])
+            saved += len(batch)
+        except Exception:
+            for row_no, record in batch:
+                try:
+                    upsert(supabase, table, record)
+                    saved += 1
+                except Exception as e:
+                    errors.append({"row": row_no, "error": str(e)})
+    return saved, errors
+
+
+def render_bulk_import(supabase, table, validate, label):
+    uploaded = st.file_uploader(f"{label} 파일 (CSV/XLSX)", type=["csv", "xlsx"], key=f"{table}_import")
+    if uploaded is None or not st.button("일괄 등록", key=f"{table}_import_run"):
+        return
+
+    started = time.perf_counter()
+    total = saved = 0
+    errors = []
+    status = st.empty()
+    try:
+        for chunk in read_chunks(uploaded, uploaded.name):
+            rows, chunk_errors = validate(chunk)
+            errors.extend(chunk_errors)
+            chunk_saved, save_errors = upsert_batches(supabase, table, rows)
+            errors.extend(save_errors)
+            total += len(chunk)
+            saved += chunk_saved
+            status.write(f"{total}행 처리 중...")
+    except ValueError as e:
+        st.error(str(e))
+        return
+    except ImportError as e:
+        # openpyxl이 설치되지 않은 환경에서 .xlsx를 올린 경우
+        st.error(f"Excel 파일을 읽을 수 없습니다. CSV로 올려 주세요. ({e})")
+        return
+
+    elapsed = time.perf_counter() - started
+    status.empty()
+    st.success(f"{total}행 중 {saved}행 저장 ({saved / max(elapsed, 1e-9):.0f}행/초)")
+    if errors:
+        st.warning(f"오류 {len(errors)}건")
+        st.dataframe(sorted(errors, key=lambda e: e["row"]), hide_index=True, use_container_width=True)
@@ -0,0 +1,189 @@
+# modules/checkin_ingestor.py
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+# 버퍼가 이 크기에 도달하면 즉시 flush
+BATCH_SIZE = 200
+# 크기와 상관없이 flush 하는 주기(초)
+FLUSH_INTERVAL = 1.0
+# DB 장애로 flush가 계속 실패할 때 메모리에 쌓아둘 최대 행 수
+MAX_BUFFER = 50000
+# 종료 시 마지막 flush 재시도 횟수 (모두 실패하면 남은 행을 spool 파일에 저장)
+FINAL_FLUSH_RETRIES = 3
+# 시작할 때 이 시간 안에 입장했고 퇴장 시간이 없는 기록을 아직 안에 있는 회원으로 복원
+OPEN_SESSION_WINDOW = timedelta(hours=12)
+
+logger = logging.getLogger(__name__)
+
+
+class BufferFullError(Exception):
+    pass
+
+
+class CheckinIngestor:
+    # 입장/퇴장 이벤트를 메모리에서 짝지어 gym_logs 행으로 만들고 묶어서 저장한다
+    # record()는 이벤트 루프 안에서 바로 끝나며 DB를 기다리지 않는다
+
+    def __init__(self, flush_rows, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 max_buffer=MAX_BUFFER, load_open=None, spool_path=None):
+        self.flush_rows = flush_rows      # 동기 함수(rows), 별도 스레드에서 실행. log_id가 있는 행은 기존 행 갱신
+        self.load_open = load_open        # 동기 함수(since) -> 퇴장 시간 없는 gym_logs 행 목록
+        self.spool_path = spool_path      # 종료 시 저장하지 못한 행을 남겨 두는 파일
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.buffer = []
+        self.open_sessions = {}           # member_id -> (입장 시각, 저장된 log_id 또는 None), 크기가 곧 현재 인원
+        self.occupancy_updated_at = None
+        self.restored_at = None           # restore()로 현재 인원을 다시 만든 시각
+        self.stats = {"received": 0, "flushed": 0, "failed_flushes": 0, "unmatched_check_outs": 0}
+        self._flush_lock = asyncio.Lock()
+        self._size_flush_pending = False
+        self._task = None
+
+    def record_many(self, events):
+        # events: (member_id, event, timestamp) 목록. 이벤트 하나가 버퍼에 최대 한 행을 더하므로
+        # 묶음 전체가 들어갈 자리가 없으면 아무것도 반영하지 않고 거절한다 (재전송해도 중복 없음)
+        if len(self.buffer) + len(events) > self.max_buffer:
+            raise BufferFullError("ingest buffer is full")
+        return [self._record(member_id, event, timestamp) for member_id, event, timestamp in events]
+
+    def record(self, member_id, event, timestamp=None):
+        return self.record_many([(member_id, event, timestamp)])[0]
+
+    def _record(self, member_id, event, timestamp=None):
+        timestamp = timestamp or datetime.now()
+        self.stats["received"] += 1
+        status = "ok"
+
+        if event == "check_in":
+            previous = self.open_sessions.get(member_id)
+            if previous is not None and previous[1] is None:
+                # 퇴장 없이 다시 입장한 경우 이전 입장은 퇴장 시간 없이 기록 (이미 저장된 행이면 그대로 둔다)
+                self._append(member_id, previous[0], None)
+            self.open_sessions[member_id] = (timestamp, None)
+        else:
+            session = self.open_sessions.pop(member_id, None)
+            if session is None:
+                self.stats["unmatched_check_outs"] += 1
+                status = "unmatched"
+            else:
+                self._append(member_id, session[0], timestamp, log_id=session[1])
+        self.occupancy_updated_at = timestamp
+        return status
+
+    def occupancy(self):
+        return {
+            "occupancy": len(self.open_sessions),
+            "updated_at": self.occupancy_updated_at.isoformat() if self.occupancy_updated_at else None,
+            "restored_at": self.restored_at.isoformat() if self.restored_at else None,
+        }
+
+    def _append(self, member_id, check_in, check_out, log_id=None):
+        row = {
+            "member_id": member_id,
+            "check_in_time": check_in.isoformat(),
+            "check_out_time": check_out.isoformat() if check_out else None,
+        }
+        if log_id is not None:
+            row["log_id"] = log_id
+        self.buffer.append(row)
+        if len(self.buffer) >= self.batch_size and not self._size_flush_pending:
+            self._size_flush_pending = True
+            self._size_flush_task = asyncio.get_running_loop().create_task(self._size_flush())
+
+    async def _size_flush(self):
+        try:
+            await self.flush()
+        finally:
+            self._size_flush_pending = False
+
+    async def flush(self):
+        async with self._flush_lock:
+            rows, self.buffer = self.buffer, []
+            if not rows:
+                return 0
+            try:
+                await asyncio.to_thread(self.flush_rows, rows)
+            except Exception:
+                # 실패한 행은 버퍼 앞에 되돌려 다음 flush에서 재시도
+                self.buffer[:0] = rows
+                self.stats["failed_flushes"] += 1
+                return 0
+            self.stats["flushed"] += len(rows)
+            return len(rows)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def restore(self):
+        # 재시작 전 상태 복원: spool 파일에 남은 행 + DB에 퇴장 시간 없이 저장된 최근 입장
+        spooled = self._read_spool()
+        rows = []
+        if self.load_open is not None:
+            since = datetime.now() - OPEN_SESSION_WINDOW
+            rows = await asyncio.to_thread(self.load_open, since)
+        # 회원별로 가장 늦은 미퇴장 입장만 열린 방문으로 본다
+        latest = {}
+        for row in rows + [r for r in spooled if r["check_out_time"] is None and "log_id" not in r]:
+            check_in = datetime.fromisoformat(row["check_in_time"])
+            current = latest.get(row["member_id"])
+            if current is None or check_in >= current[0]:
+                latest[row["member_id"]] = (check_in, row)
+        for member_id, (check_in, row) in latest.items():
+            self.open_sessions[member_id] = (check_in, row.get("log_id"))
+        # 열린 방문으로 복원하지 않은 spool 행은 다시 저장 대기열로
+        restored = {id(row) for _, row in latest.values()}
+        self.buffer[:0] = [r for r in spooled if id(r) not in restored]
+        self.restored_at = datetime.now()
+        return len(self.open_sessions)
+
+    def _read_spool(self):
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return []
+        with open(self.spool_path, encoding="utf-8") as f:
+            rows = json.load(f)
+        os.remove(self.spool_path)
+        return rows
+
+    def _write_spool(self):
+        tmp = f"{self.spool_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.buffer, f, ensure_ascii=False)
+        os.replace(tmp, self.spool_path)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 아직 퇴장하지 않은 입장 기록도 잃지 않도록 퇴장 시간 없이 저장 (다음 시작 때 restore()로 복원)
+        for member_id, (check_in, log_id) in self.open_sessions.items():
+            if log_id is None:
+                self._append(member_id, check_in, None)
+        self.open_sessions.clear()
+        for attempt in range(FINAL_FLUSH_RETRIES):
+            await self.flush()
+            if not self.buffer:
+                return
+            await asyncio.sleep(0.5 * 2 ** attempt)
+        if self.spool_path:
+            self._write_spool()
+            logger.error("final flush failed, %d rows saved to %s", len(self.buffer), self.spool_path)
+        else:
+            logger.error("final flush failed, %d rows lost", len(self.buffer))
+
+    def snapshot(self):
+        return {**self.stats, "buffered": len(self.buffer), "open_sessions": len(self.open_sessions)}
@@ -0,0 +1,40 @@
+# modules/dashboard.py
+import os
+import requests
+import streamlit as st
+from modules.expiry_index import get_expiry_index
+
+# checkin_api 서비스 주소 (현재 인원은 API 프로세스 메모리에서 관리, 재시작하면 gym_logs의 미퇴장 기록으로 복원)
+CHECKIN_API_URL = os.getenv("CHECKIN_API_URL", "http://localhost:8000")
+
+def show_occupancy():
+    try:
+        resp = requests.get(f"{CHECKIN_API_URL}/occupancy", timeout=1)
+        resp.raise_for_status()
+        data = resp.json()
+        st.metric("현재 헬스장 인원", f"{data['occupancy']}명")
+        if data.get("updated_at"):
+            st.caption(f"마지막 출입: {data['updated_at']}")
+        elif data.get("restored_at"):
+            st.caption(f"API 재시작 후 출입 기록에서 복원: {data['restored_at']}")
+    except Exception:
+        st.metric("현재 헬스장 인원", "-")
+        st.caption("출입 API에 연결할 수 없습니다.")
+
+def show_expiring_members(supabase):
+    days = st.slider("만료 조회 기간 (일)", 1, 60, 7, key="dashboard_expiry_days")
+    members = get_expiry_index(supabase).expiring_within(days)
+    st.metric(f"{days}일 안에 만료되는 회원", f"{len(members)}명")
+    if members:
+        st.dataframe(
+            [{"이름": m["name"], "전화": m.get("phone"), "만료일": m["membership_expiration"]} for m in members],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+def show_dashboard(supabase):
+    left, right = st.columns([1, 3])
+    with left:
+        show_occupancy()
+    with right:
+        show_expiring_members(supabase)
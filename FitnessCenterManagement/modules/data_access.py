@@ -0,0 +1,141 @@
+# modules/data_access.py
+import threading
+import time
+from collections import OrderedDict
+
+# 기본 캐시 유지 시간(초)
+DEFAULT_TTL = 30
+# 캐시 항목 수 상한. 넘으면 가장 오래 안 쓴 항목부터 버린다
+MAX_CACHE_ENTRIES = 256
+# 목록 화면 한 페이지당 행 수
+PAGE_SIZE = 50
+
+# (테이블, 쿼리 키) -> (만료 시각, 데이터), 최근에 쓴 순서로 정렬 (LRU)
+# 모듈 전역에 두어 Streamlit rerun 사이에도 유지된다
+_cache = OrderedDict()
+_lock = threading.Lock()
+# 테이블 -> 쓰기 후 호출할 함수 목록 (메모리 인덱스 갱신용)
+_write_listeners = {}
+# 테이블 -> 무효화 횟수. 조회 도중 쓰기가 끼어들면 끝난 조회 결과(쓰기 전 데이터)를 저장하지 않는다
+_generations = {}
+# clear_cache 횟수 (모든 테이블의 세대가 한꺼번에 바뀐 것으로 본다)
+_epoch = 0
+
+
+def _generation(table):
+    return _epoch, _generations.get(table, 0)
+
+
+def _prune(now):
+    # 저장할 때마다 만료된 항목을 지우고 상한을 넘은 만큼 오래된 항목을 버린다 (_lock 안에서 호출)
+    for cache_key in [k for k, entry in _cache.items() if entry[0] <= now]:
+        del _cache[cache_key]
+    while len(_cache) > MAX_CACHE_ENTRIES:
+        _cache.popitem(last=False)
+
+
+def cached_query(table, key, fetch, ttl=DEFAULT_TTL):
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get((table, key))
+        if entry is not None and entry[0] > now:
+            _cache.move_to_end((table, key))
+            return entry[1]
+        generation = _generation(table)
+
+    data = fetch()
+    with _lock:
+        if _generation(table) == generation:
+            _cache[(table, key)] = (now + ttl, data)
+            _cache.move_to_end((table, key))
+            _prune(now)
+    return data
+
+
+def invalidate(table):
+    # 해당 테이블에 걸린 캐시 항목만 제거
+    with _lock:
+        _generations[table] = _generations.get(table, 0) + 1
+        for cache_key in [k for k in _cache if k[0] == table]:
+            del _cache[cache_key]
+
+
+def clear_cache():
+    global _epoch
+    with _lock:
+        _epoch += 1
+        _cache.clear()
+
+
+def add_write_listener(table, listener):
+    # listener(rows): 삽입/갱신된 행 목록을 받는다
+    _write_listeners.setdefault(table, []).append(listener)
+
+
+def _after_write(table, rows):
+    invalidate(table)
+    for listener in _write_listeners.get(table, []):
+        listener(rows or [])
+
+
+def select_all(supabase, table, columns="*", ttl=DEFAULT_TTL):
+    return cached_query(
+        table,
+        ("select", columns),
+        lambda: supabase.table(table).select(columns).execute().data or [],
+        ttl,
+    )
+
+
+def _clean_search(text):
+    # PostgREST or 필터 문법을 깨뜨리는 문자 제거
+    return "".join(c for c in (text or "").strip() if c not in ",()%*")
+
+
+def fetch_page(supabase, table, columns, key_column, after=None, limit=PAGE_SIZE,
+               search=None, search_columns=()):
+    # key_column 기준 keyset 페이지네이션: offset 없이 마지막 키 다음부터 조회
+    search = _clean_search(search)
+
+    def fetch():
+        query = supabase.table(table).select(columns).order(key_column).limit(limit)
+        if after is not None:
+            query = query.gt(key_column, after)
+        if search and search_columns:
+            query = query.or_(",".join(f"{c}.ilike.*{search}*" for c in search_columns))
+        return query.execute().data or []
+
+    # 검색어마다 키가 새로 생기고 다시 쓰일 일이 드물어 공유 캐시에 넣지 않는다
+    # (넣으면 자주 쓰는 목록/전체 조회 항목을 LRU에서 밀어낸다)
+    if search and search_columns:
+        return fetch()
+    return cached_query(table, ("page", columns, key_column, after, limit), fetch)
+
+
+def insert(supabase, table, rows):
+    # write-through: 삽입 후 같은 테이블의 캐시를 무효화
+    try:
+        res = supabase.table(table).insert(rows).execute()
+    except Exception:
+        invalidate(table)
+        raise
+    _after_write(table, res.data)
+    return res
+
+
+def upsert(supabase, table, rows):
+    try:
+        res = supabase.table(table).upsert(rows).execute()
+    except Exception:
+        invalidate(table)
+        raise
+    _after_write(table, res.data)
+    return res
+
+
+def load_members(supabase):
+    return select_all(supabase, "members")
+
+
+def load_trainers(supabase):
+    return select_all(supabase, "trainers")
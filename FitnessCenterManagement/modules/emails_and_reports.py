@@ -3,6 +3,14 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import streamlit as st
+import threading
+from modules.mail_sender import BulkMailer
+from modules.data_access import load_trainers
+from modules.expiry_index import get_expiry_index
+
+# (서버, 포트, 발신자) -> BulkMailer, rerun 사이에 연결을 재사용하기 위해 모듈 전역에 보관
+_mailers = {}
+_mailers_lock = threading.Lock()
 
 def send_email(recipient, subject, body, email_sender, email_password):
     try:
@@ -24,8 +32,72 @@ def send_email(recipient, subject, body, email_sender, email_password):
         st.error(f"이메일 발송 실패: {str(e)}")
 
 def generate_report(supabase):
-    # 통계 또는 보고서 생성 예시
-    st.write("통계 보고서 예시")
-    data = supabase.table("pt_reservations").select("*").execute().data
-    for item in data:
-        st.write(item)
+    # 통계 화면에서만 쓰는 pandas/plotly는 여기서 불러온다
+    import plotly.express as px
+    from modules.report_engine import get_report_engine, AVAILABLE_HOURS_PER_WEEK
+    st.subheader("통계 보고서")
+    engine = get_report_engine()
+    # 마지막 워터마크 이후 새로 들어온 행만 집계에 반영
+    processed = engine.refresh(supabase)
+    st.caption(f"새로 반영된 행: 예약 {processed['pt_reservations']}건 / 출입 {processed['gym_logs']}건")
+
+    trainer_names = {t["trainer_id"]: t["name"] for t in load_trainers(supabase)}
+
+    st.markdown("**트레이너별 주간 예약 수**")
+    weekly = engine.reservations_per_trainer_week().rename(columns=trainer_names)
+    if weekly.empty:
+        st.write("예약 데이터가 없습니다.")
+    else:
+        st.bar_chart(weekly)
+
+        st.markdown(f"**트레이너 이용률 (%)** - 주 {AVAILABLE_HOURS_PER_WEEK}시간 기준")
+        st.dataframe(engine.utilization().rename(columns=trainer_names).tail(8), use_container_width=True)
+
+    st.markdown("**회원 방문 빈도 (상위 20명)**")
+    st.dataframe(engine.visit_frequency().head(20), hide_index=True, use_container_width=True)
+
+    st.markdown("**요일/시간대별 입장 히트맵**")
+    heatmap = engine.peak_heatmap()
+    fig = px.imshow(heatmap, labels={"x": "시간", "y": "요일", "color": "입장 수"}, aspect="auto")
+    st.plotly_chart(fig, use_container_width=True)
+
+def get_mailer(smtp_server, smtp_port, email_sender, email_password):
+    key = (smtp_server, smtp_port, email_sender)
+    with _mailers_lock:
+        mailer = _mailers.get(key)
+        if mailer is None:
+            mailer = BulkMailer(smtp_server, smtp_port, email_sender, email_password, workers=2)
+            _mailers[key] = mailer
+        else:
+            mailer.set_password(email_password)
+        return mailer
+
+def send_expiry_reminders(supabase, email_sender, email_password, smtp_server, smtp_port=587):
+    st.subheader("만료 예정 회원 알림 메일")
+    days = st.slider("만료까지 남은 일수", 1, 60, 7)
+    members = get_expiry_index(supabase).expiring_within(days)
+    targets = [m for m in members if m.get("email")]
+    st.write(f"발송 대상: {len(targets)}명")
+
+    if st.button("알림 메일 발송", disabled=not targets):
+        mailer = get_mailer(smtp_server, smtp_port, email_sender, email_password)
+        # 백그라운드 큐에 넣고 바로 반환, 결과는 future로 확인
+        st.session_state["mail_jobs"] = [
+            mailer.submit(
+                m["email"],
+                "회원권 만료 안내",
+                f"{m['name']}님, 회원권이 {m['membership_expiration']}에 만료됩니다.",
+            )
+            for m in targets
+        ]
+
+    jobs = st.session_state.get("mail_jobs")
+    if jobs:
+        done = [f.result() for f in jobs if f.done()]
+        st.progress(len(done) / len(jobs), text=f"{len(done)}/{len(jobs)} 처리됨")
+        if done:
+            failed = sum(1 for r in done if not r["ok"])
+            st.write(f"성공 {len(done) - failed}건 / 실패 {failed}건")
+            st.dataframe(done, hide_index=True, use_container_width=True)
+        if len(done) < len(jobs):
+            st.button("발송 현황 새로고침")
@@ -0,0 +1,92 @@
+# modules/expiry_index.py
+import bisect
+import threading
+import time
+from datetime import date, timedelta
+from modules.data_access import add_write_listener
+
+FETCH_BATCH = 1000
+# 다른 프로세스에서 바뀐 내용을 반영하기 위한 전체 재적재 주기(초)
+RELOAD_INTERVAL = 600
+COLUMNS = "member_id, name, phone, email, membership_expiration"
+
+
+def _to_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class ExpiryIndex:
+    # (만료일, member_id) 정렬 배열. "N일 안에 만료" 는 이분 탐색 범위 조회로 처리
+
+    def __init__(self):
+        self.keys = []
+        self.members = {}   # member_id -> 회원 행
+        self.loaded_at = None
+        self._lock = threading.Lock()
+
+    def load(self, supabase):
+        members = {}
+        last_id = None
+        while True:
+            query = supabase.table("members").select(COLUMNS).order("member_id").limit(FETCH_BATCH)
+            if last_id is not None:
+                query = query.gt("member_id", last_id)
+            batch = query.execute().data or []
+            for row in batch:
+                if row.get("membership_expiration"):
+                    members[row["member_id"]] = row
+            if len(batch) < FETCH_BATCH:
+                break
+            last_id = batch[-1]["member_id"]
+
+        keys = sorted((_to_date(r["membership_expiration"]), m) for m, r in members.items())
+        with self._lock:
+            self.members = members
+            self.keys = keys
+            self.loaded_at = time.monotonic()
+
+    def upsert(self, row):
+        member_id = row.get("member_id")
+        if member_id is None or not row.get("membership_expiration"):
+            return
+        with self._lock:
+            old = self.members.get(member_id)
+            if old is not None:
+                old_key = (_to_date(old["membership_expiration"]), member_id)
+                i = bisect.bisect_left(self.keys, old_key)
+                if i < len(self.keys) and self.keys[i] == old_key:
+                    del self.keys[i]
+            self.members[member_id] = {**(old or {}), **row}
+            bisect.insort(self.keys, (_to_date(row["membership_expiration"]), member_id))
+
+    def on_write(self, rows):
+        if self.loaded_at is None:
+            return
+        for row in rows:
+            self.upsert(row)
+
+    def expiring_between(self, start, end):
+        # start <= 만료일 <= end 인 회원을 만료일 순으로 반환
+        with self._lock:
+            lo = bisect.bisect_left(self.keys, (start,))
+            hi = bisect.bisect_left(self.keys, (end + timedelta(days=1),))
+            return [self.members[m] for _, m in self.keys[lo:hi]]
+
+    def expiring_within(self, days, today=None):
+        today = today or date.today()
+        return self.expiring_between(today, today + timedelta(days=days))
+
+
+_index = ExpiryIndex()
+add_write_listener("members", _index.on_write)
+_load_lock = threading.Lock()
+
+
+def get_expiry_index(supabase):
+    # 처음 사용할 때와 RELOAD_INTERVAL이 지났을 때만 전체를 불러온다
+    with _load_lock:
+        if _index.loaded_at is None or time.monotonic() - _index.loaded_at > RELOAD_INTERVAL:
+            _index.load(supabase)
+    return _index
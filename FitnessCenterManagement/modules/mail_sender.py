@@ -0,0 +1,153 @@
+# modules/mail_sender.py
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import Future
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+
+def response_code(e):
+    # SMTP 응답 오류의 코드. 수신자 거절은 수신자별 코드 중 가장 큰 값
+    # 5xx는 재시도해도 의미 없는 영구 실패, 4xx(그레이리스팅 등)는 잠시 후 재시도
+    # (로그인 실패는 메일러 전체를 멈추므로 따로 처리)
+    if isinstance(e, smtplib.SMTPRecipientsRefused):
+        return max(code for code, _ in e.recipients.values())
+    return e.smtp_code
+
+
+def build_message(email_sender, recipient, subject, body):
+    msg = MIMEMultipart()
+    msg["From"] = email_sender
+    msg["To"] = recipient
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "plain"))
+    return msg.as_string()
+
+
+class BulkMailer:
+    # 인증된 SMTP 연결을 워커마다 하나씩 유지하며 큐에 쌓인 메일을 보낸다
+    # workers 수가 곧 동시 연결 수(=동시성 상한)
+
+    def __init__(self, host, port, email_sender, email_password, use_tls=True,
+                 workers=2, max_retries=3, backoff=1.0, timeout=30):
+        self.host = host
+        self.port = port
+        self.email_sender = email_sender
+        self.email_password = email_password
+        self.use_tls = use_tls
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        # 로그인 실패 메시지. 설정되면 비밀번호가 바뀔 때까지 다시 로그인하지 않고 남은 메일을 실패 처리
+        self.auth_error = None
+        self._queue = queue.Queue()
+        self._threads = []
+        for i in range(workers):
+            t = threading.Thread(target=self._worker, name=f"mailer-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.email_password:
+                server.login(self.email_sender, self.email_password)
+        except BaseException:
+            # TLS/로그인 실패 시 연결된 소켓을 닫고 예외를 그대로 올린다
+            self._close(server)
+            raise
+        return server
+
+    def set_password(self, email_password):
+        # 비밀번호가 바뀌면 로그인 실패 상태를 풀어 다시 시도할 수 있게 한다
+        if email_password != self.email_password:
+            self.email_password = email_password
+            self.auth_error = None
+
+    def _close(self, server):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _worker(self):
+        server = None
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._close(server)
+                self._queue.task_done()
+                return
+            recipient, subject, body, future = job
+            result = {"recipient": recipient, "ok": False, "attempts": 0, "error": None}
+            try:
+                server = self._send(server, recipient, subject, body, result)
+            except Exception as e:
+                # 예상하지 못한 오류로 워커가 죽으면 이 메일의 future가 영원히 끝나지 않으므로 여기서 잡는다
+                result["ok"] = False
+                result["error"] = f"{type(e).__name__}: {e}"
+                self._close(server)
+                server = None
+            finally:
+                future.set_result(result)
+                self._queue.task_done()
+
+    def _send(self, server, recipient, subject, body, result):
+        # 재시도하며 한 통을 보내고 result를 채운다. 다음 메일에 재사용할 연결을 반환
+        if self.auth_error is not None:
+            result["error"] = self.auth_error
+            return server
+        message = build_message(self.email_sender, recipient, subject, body)
+        for attempt in range(1, self.max_retries + 1):
+            result["attempts"] = attempt
+            try:
+                if server is None:
+                    server = self._connect()
+                server.sendmail(self.email_sender, recipient, message)
+                result["ok"] = True
+                result["error"] = None
+                break
+            except smtplib.SMTPAuthenticationError as e:
+                # 이 메일만이 아니라 이 계정으로 보내는 모든 메일이 실패하므로 메일러 전체를 멈춘다
+                result["error"] = str(e)
+                self.auth_error = str(e)
+                self._close(server)
+                server = None
+                break
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                result["error"] = str(e)
+                if response_code(e) >= 500:
+                    break
+                if attempt < self.max_retries:
+                    time.sleep(self.backoff * (2 ** (attempt - 1)))
+            except (smtplib.SMTPException, OSError) as e:
+                # 끊긴 연결은 버리고 다음 시도에서 다시 연결
+                result["error"] = str(e)
+                self._close(server)
+                server = None
+                if attempt < self.max_retries:
+                    time.sleep(self.backoff * (2 ** (attempt - 1)))
+        return server
+
+    def submit(self, recipient, subject, body):
+        future = Future()
+        self._queue.put((recipient, subject, body, future))
+        return future
+
+    def send_bulk(self, messages):
+        # messages: (recipient, subject, body) 목록 -> 수신자별 결과 목록
+        futures = [self.submit(*m) for m in messages]
+        return [f.result() for f in futures]
+
+    def close(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        self._threads = []
@@ -1,23 +1,63 @@
 # modules/member_trainer_management.py
 import streamlit as st
 from datetime import datetime, timedelta  # timedelta 추가
-from supabase import create_client
+from modules.data_access import fetch_page, insert, PAGE_SIZE
+from modules.bulk_import import render_bulk_import, validate_members
 
-def load_members(supabase):
-    return supabase.table("members").select("*").execute().data or []
+# 목록에 표시할 컬럼 (DB 컬럼명 -> 화면 표시명)
+MEMBER_COLUMNS = {
+    "name": "이름",
+    "phone": "전화",
+    "email": "이메일",
+    "membership_registration": "등록일",
+    "membership_expiration": "만료일",
+}
+TRAINER_COLUMNS = {
+    "name": "이름",
+    "phone": "전화",
+    "contract_start": "계약 시작",
+    "contract_end": "계약 종료",
+}
 
-def load_trainers(supabase):
-    return supabase.table("trainers").select("*").execute().data or []
+def render_paged_table(supabase, table, key_column, columns, empty_message):
+    # 필요한 컬럼만 한 페이지씩 가져와 하나의 dataframe으로 표시
+    search = st.text_input("이름/전화번호 검색", key=f"{table}_search")
+    cursor_key = f"{table}_cursors"
+    if st.session_state.get(f"{table}_last_search") != search:
+        st.session_state[f"{table}_last_search"] = search
+        st.session_state[cursor_key] = [None]
+    cursors = st.session_state.setdefault(cursor_key, [None])
 
-def manage_members(supabase):
-    st.header("회원 관리")
-    members = load_members(supabase)
+    select = ", ".join([key_column] + list(columns))
+    rows = fetch_page(supabase, table, select, key_column, after=cursors[-1],
+                      limit=PAGE_SIZE + 1, search=search, search_columns=("name", "phone"))
+    has_next = len(rows) > PAGE_SIZE
+    rows = rows[:PAGE_SIZE]
 
-    if not members:
-        st.write("등록된 회원이 없습니다.")
+    if not rows:
+        st.write(empty_message)
     else:
-        for m in members:
-            st.write(f"- {m['name']} / 전화: {m['phone']} / 이메일: {m.get('email', '없음')} / 등록일: {m['membership_registration']} / 만료일: {m['membership_expiration']}")
+        st.dataframe(
+            [{label: r.get(col) for col, label in columns.items()} for r in rows],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    with page_col:
+        st.caption(f"{len(cursors)} 페이지")
+    with prev_col:
+        if st.button("이전", key=f"{table}_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with next_col:
+        if st.button("다음", key=f"{table}_next", disabled=not has_next):
+            cursors.append(rows[-1][key_column])
+            st.rerun()
+
+def manage_members(supabase):
+    st.header("회원 관리")
+    render_paged_table(supabase, "members", "member_id", MEMBER_COLUMNS, "등록된 회원이 없습니다.")
 
     membership_levels = ["실버", "골드", "플래티넘", "다이아몬드"]
     st.subheader("회원 등록")
@@ -37,27 +77,25 @@ def manage_members(supabase):
             else:
                 try:
                     # 회원 정보 삽입
-                    supabase.table("members").insert({
+                    insert(supabase, "members", {
                         "name": name,
                         "phone": phone,
                         "email": email,
                         "membership_registration": reg_date.isoformat(),
                         "membership_expiration": exp_date.isoformat(),
                         "membership_level": membership_level
-                    }).execute()
+                    })
                     st.success("회원 등록 완료")
                 except Exception as e:
                     st.error(f"회원 등록 실패: {str(e)}")
 
+    with st.expander("회원 일괄 등록 (CSV/Excel)"):
+        st.caption("컬럼: name, phone, email, membership_registration, membership_expiration, membership_level (member_id가 있으면 갱신)")
+        render_bulk_import(supabase, "members", validate_members, "회원")
+
 def manage_trainers(supabase):
     st.header("트레이너 관리")
-    trainers = load_trainers(supabase)
-
-    if not trainers:
-        st.write("등록된 트레이너가 없습니다.")
-    else:
-        for t in trainers:
-            st.write(f"- {t['name']} / 전화: {t['phone']} / 계약: {t['contract_start']} ~ {t['contract_end']}")
+    render_paged_table(supabase, "trainers", "trainer_id", TRAINER_COLUMNS, "등록된 트레이너가 없습니다.")
 
     st.subheader("트레이너 등록")
     with st.form("trainer_form"):
@@ -73,12 +111,12 @@ def manage_trainers(supabase):
             else:
                 try:
                     # 트레이너 정보 삽입
-                    supabase.table("trainers").insert({
+                    insert(supabase, "trainers", {
                         "name": name,
                         "phone": phone,
                         "contract_start": contract_start.isoformat(),
                         "contract_end": contract_end.isoformat()
-                    }).execute()
+                    })
                     st.success("트레이너 등록 완료")
                 except Exception as e:
                     st.error(f"트레이너 등록 실패: {str(e)}")
@@ -0,0 +1,133 @@
+# modules/report_engine.py
+import threading
+import numpy as np
+import pandas as pd
+
+# 한 번에 가져올 행 수 (Supabase 기본 응답 상한과 동일)
+FETCH_BATCH = 1000
+# 트레이너 1인당 주간 가용 시간 (이용률 계산 기준)
+AVAILABLE_HOURS_PER_WEEK = 40
+# 증분 갱신 기준 컬럼 (단조 증가하는 기본키)
+WATERMARK_COLUMNS = {"pt_reservations": "reservation_id", "gym_logs": "log_id"}
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+def _to_datetime(series):
+    return pd.to_datetime(series, utc=True, format="ISO8601").dt.tz_localize(None)
+
+
+def _week_start(series):
+    return series.dt.to_period("W-SUN").dt.start_time
+
+
+def _accumulate(total, new):
+    new = new.astype("float64")
+    if total.empty:
+        return new
+    return total.add(new, fill_value=0)
+
+
+class ReportEngine:
+    # 집계 결과만 누적해 두고, 새로 들어온 행만 벡터 연산으로 반영한다
+
+    def __init__(self):
+        self.watermarks = {table: None for table in WATERMARK_COLUMNS}
+        self.reservation_count = pd.Series(dtype="float64")   # (trainer_id, week) -> 예약 수
+        self.reservation_hours = pd.Series(dtype="float64")   # (trainer_id, week) -> 예약 시간
+        self.member_visits = pd.Series(dtype="float64")       # (member_id, week) -> 방문 수
+        self.peak_hours = np.zeros((7, 24), dtype=np.int64)   # 요일 x 시간 입장 수
+        self._lock = threading.Lock()
+
+    def _fetch_new(self, supabase, table, columns):
+        key = WATERMARK_COLUMNS[table]
+        watermark = self.watermarks[table]
+        frames = []
+        while True:
+            query = supabase.table(table).select(", ".join(columns)).order(key).limit(FETCH_BATCH)
+            if watermark is not None:
+                query = query.gt(key, watermark)
+            batch = query.execute().data or []
+            if not batch:
+                break
+            frames.append(pd.DataFrame.from_records(batch, columns=columns))
+            watermark = batch[-1][key]
+            if len(batch) < FETCH_BATCH:
+                break
+        if not frames:
+            return None, watermark
+        return pd.concat(frames, ignore_index=True), watermark
+
+    def _apply_reservations(self, df):
+        start = _to_datetime(df["reservation_start"])
+        end = _to_datetime(df["reservation_end"])
+        keys = [df["trainer_id"], _week_start(start).rename("week")]
+        hours = ((end - start).dt.total_seconds() / 3600).clip(lower=0)
+        grouped = hours.groupby(keys)
+        self.reservation_count = _accumulate(self.reservation_count, grouped.size())
+        self.reservation_hours = _accumulate(self.reservation_hours, grouped.sum())
+
+    def _apply_gym_logs(self, df):
+        check_in = _to_datetime(df["check_in_time"]).dropna()
+        members = df.loc[check_in.index, "member_id"]
+        visits = members.groupby([members, _week_start(check_in).rename("week")]).size()
+        self.member_visits = _accumulate(self.member_visits, visits)
+        np.add.at(self.peak_hours, (check_in.dt.weekday.to_numpy(), check_in.dt.hour.to_numpy()), 1)
+
+    def refresh(self, supabase):
+        # 워터마크 이후 행만 가져와 집계에 더하고, 새로 처리한 행 수를 반환
+        processed = {}
+        with self._lock:
+            df, watermark = self._fetch_new(supabase, "pt_reservations", [
+                "reservation_id", "trainer_id", "reservation_start", "reservation_end"])
+            if df is not None:
+                self._apply_reservations(df)
+                self.watermarks["pt_reservations"] = watermark
+            processed["pt_reservations"] = 0 if df is None else len(df)
+
+            df, watermark = self._fetch_new(supabase, "gym_logs", [
+                "log_id", "member_id", "check_in_time"])
+            if df is not None:
+                self._apply_gym_logs(df)
+                self.watermarks["gym_logs"] = watermark
+            processed["gym_logs"] = 0 if df is None else len(df)
+        return processed
+
+    def reservations_per_trainer_week(self):
+        # 행: 주, 열: 트레이너
+        if self.reservation_count.empty:
+            return pd.DataFrame()
+        return self.reservation_count.unstack(level=0, fill_value=0).sort_index().astype("int64")
+
+    def utilization(self):
+        if self.reservation_hours.empty:
+            return pd.DataFrame()
+        hours = self.reservation_hours.unstack(level=0, fill_value=0).sort_index()
+        return (hours / AVAILABLE_HOURS_PER_WEEK * 100).round(1)
+
+    def visit_frequency(self):
+        if self.member_visits.empty:
+            return pd.DataFrame(columns=["member_id", "방문 수", "방문 주 수", "주당 평균 방문"])
+        grouped = self.member_visits.groupby(level=0)
+        out = pd.DataFrame({
+            "방문 수": grouped.sum().astype("int64"),
+            "방문 주 수": grouped.size(),
+        })
+        out["주당 평균 방문"] = (out["방문 수"] / out["방문 주 수"]).round(2)
+        out.index.name = "member_id"
+        return out.sort_values("방문 수", ascending=False).reset_index()
+
+    def peak_heatmap(self):
+        return pd.DataFrame(self.peak_hours, index=WEEKDAYS, columns=range(24))
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_report_engine():
+    # 프로세스 전체에서 하나의 집계 상태를 공유
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ReportEngine()
+        return _engine
@@ -1,33 +1,88 @@
 # modules/reservation_management.py
 import streamlit as st
-from datetime import datetime, timedelta
-from supabase import create_client
-import time
-
-def load_members(supabase):
-    return supabase.table("members").select("*").execute().data or []
-
-def load_trainers(supabase):
-    return supabase.table("trainers").select("*").execute().data or []
+from datetime import datetime, timedelta, time
+from modules.data_access import load_members, load_trainers, insert
+from modules.schedule_index import get_schedule_index
+from modules.bulk_import import render_bulk_import, validate_gym_logs
 
 def add_pt_reservation(supabase, trainer_id, member_id, start_dt, end_dt):
-    supabase.table("pt_reservations").insert({
-        "trainer_id": trainer_id,
-        "member_id": member_id,
-        "reservation_start": start_dt.isoformat(),
-        "reservation_end": end_dt.isoformat()
-    }).execute()
+    if end_dt <= start_dt:
+        st.error("종료 시간은 시작 시간 이후여야 합니다.")
+        return False
+    schedule = get_schedule_index().get(supabase, trainer_id)
+    # 같은 트레이너의 예약 확인과 삽입 사이에 다른 예약이 끼어들지 않도록 잠금
+    with schedule.lock:
+        conflicts = schedule.overlapping(start_dt, end_dt)
+        if conflicts:
+            st.error(f"해당 시간에 이미 예약이 {len(conflicts)}건 있습니다.")
+            slots = schedule.next_free_slots(start_dt, end_dt - start_dt)
+            if slots:
+                st.info("가능한 시간: " + ", ".join(s.strftime("%m/%d %H:%M") for s in slots))
+            return False
+
+        row = {
+            "trainer_id": trainer_id,
+            "member_id": member_id,
+            "reservation_start": start_dt.isoformat(),
+            "reservation_end": end_dt.isoformat()
+        }
+        insert(supabase, "pt_reservations", row)
+        schedule.add(start_dt, end_dt, row)
     st.success("PT 예약 등록 완료")
+    return True
 
 def get_trainer_schedule(supabase, trainer_id, start_date, end_date):
-    schedule = supabase.table("pt_reservations")\
-        .select("reservation_start, reservation_end")\
-        .eq("trainer_id", trainer_id)\
-        .gte("reservation_start", start_date.isoformat())\
-        .lte("reservation_end", end_date.isoformat())\
-        .execute().data
+    # 기간과 조금이라도 겹치는 예약을 반환 (end_date 당일 포함)
+    if not isinstance(end_date, datetime):
+        end_date = datetime.combine(end_date + timedelta(days=1), time.min)
+    schedule = get_schedule_index().get(supabase, trainer_id)
+    return [
+        {"reservation_start": r["reservation_start"], "reservation_end": r["reservation_end"]}
+        for r in schedule.overlapping(start_date, end_date)
+    ]
+
+def manage_pt_reservations(supabase):
+    st.header("PT 예약 등록")
+    members = load_members(supabase)
+    trainers = load_trainers(supabase)
+    member_map = {m['name']: m['member_id'] for m in members}
+    trainer_map = {t['name']: t['trainer_id'] for t in trainers}
+    if not member_map or not trainer_map:
+        st.write("등록된 회원 또는 트레이너가 없습니다.")
+        return
+
+    selected_trainer = st.selectbox("트레이너 선택", list(trainer_map.keys()))
+    trainer_id = trainer_map[selected_trainer]
+
+    with st.form("pt_reservation_form"):
+        selected_member = st.selectbox("회원 선택 (예약용)", list(member_map.keys()))
+        reservation_date = st.date_input("예약 날짜", datetime.today())
+        start_time = st.time_input("시작 시간", time(10, 0))
+        end_time = st.time_input("종료 시간", time(11, 0))
+        submitted = st.form_submit_button("예약")
 
-    return schedule
+        if submitted:
+            add_pt_reservation(
+                supabase, trainer_id, member_map[selected_member],
+                datetime.combine(reservation_date, start_time),
+                datetime.combine(reservation_date, end_time),
+            )
+
+    st.subheader("트레이너 일정 조회")
+    start_date = st.date_input("조회 시작일", datetime.today(), key="schedule_start")
+    end_date = st.date_input("조회 종료일", datetime.today() + timedelta(days=7), key="schedule_end")
+    if end_date < start_date:
+        st.error("조회 종료일은 시작일 이후여야 합니다.")
+        return
+    reservations = get_trainer_schedule(supabase, trainer_id, datetime.combine(start_date, time.min), end_date)
+    if not reservations:
+        st.write("해당 기간에 예약이 없습니다.")
+    else:
+        st.dataframe(
+            [{"시작": r["reservation_start"], "종료": r["reservation_end"]} for r in reservations],
+            hide_index=True,
+            use_container_width=True,
+        )
 
 def manage_gym_logs(supabase):
     st.header("헬스장 출입 기록 등록")
@@ -47,9 +102,13 @@ def manage_gym_logs(supabase):
         if check_out < check_in:
             st.error("퇴장 시간은 입장 시간 이후여야 합니다.")
         else:
-            supabase.table("gym_logs").insert({
+            insert(supabase, "gym_logs", {
                 "member_id": member_map[selected_member_reg],
                 "check_in_time": check_in.isoformat(),
                 "check_out_time": check_out.isoformat()
-            }).execute()
+            })
             st.success("출입 기록 저장 완료")
+
+    with st.expander("출입 기록 일괄 등록 (CSV/Excel)"):
+        st.caption("컬럼: member_id, check_in_time, check_out_time")
+        render_bulk_import(supabase, "gym_logs", validate_gym_logs, "출입 기록")
@@ -0,0 +1,139 @@
+# modules/schedule_index.py
+import bisect
+import threading
+from datetime import datetime, time, timedelta, timezone
+from time import monotonic
+
+FETCH_BATCH = 1000
+# 다른 프로세스(다른 서버, 직접 DB 수정)에서 바뀐 예약을 반영하기 위한 트레이너별 재적재 주기(초)
+RELOAD_INTERVAL = 600
+# 빈 시간 추천 시 사용할 운영 시간
+OPEN_HOUR = 6
+CLOSE_HOUR = 23
+
+
+def to_datetime(value):
+    # DB 문자열/날짜를 tz 없는 datetime으로 통일 (tz가 있으면 UTC 기준 시각으로 변환)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class TrainerSchedule:
+    # 시작 시각 기준 정렬 배열 + 최장 예약 길이로 겹치는 구간을 이분 탐색한다
+    # 겹침 후보는 [start - max_duration, end) 사이에 시작한 예약뿐이다
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.rows = []
+        self.max_duration = timedelta(0)
+        self.lock = threading.Lock()
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, start, end, row=None):
+        start, end = to_datetime(start), to_datetime(end)
+        i = bisect.bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.rows.insert(i, row or {})
+        self.max_duration = max(self.max_duration, end - start)
+
+    def replace(self, other):
+        # 다시 불러온 내용으로 바꾼다. 예약 중인 쪽이 잡고 있는 lock은 그대로 둔다
+        self.starts, self.ends, self.rows = other.starts, other.ends, other.rows
+        self.max_duration = other.max_duration
+        self.loaded_at = monotonic()
+
+    def overlapping(self, start, end):
+        start, end = to_datetime(start), to_datetime(end)
+        lo = bisect.bisect_left(self.starts, start - self.max_duration)
+        hi = bisect.bisect_left(self.starts, end)
+        return [self.rows[i] for i in range(lo, hi) if self.ends[i] > start]
+
+    def has_conflict(self, start, end):
+        return bool(self.overlapping(start, end))
+
+    def next_free_slots(self, start, duration, count=3, max_days=14):
+        # start 이후 운영 시간 안에서 duration 길이의 빈 시간을 count개 찾는다
+        slots = []
+        t = to_datetime(start)
+        limit = t + timedelta(days=max_days)
+        while len(slots) < count and t < limit:
+            if t.hour < OPEN_HOUR:
+                t = t.replace(hour=OPEN_HOUR, minute=0, second=0, microsecond=0)
+            close = t.replace(hour=CLOSE_HOUR, minute=0, second=0, microsecond=0)
+            if t + duration > close:
+                t = (t + timedelta(days=1)).replace(hour=OPEN_HOUR, minute=0, second=0, microsecond=0)
+                continue
+            lo = bisect.bisect_left(self.starts, t - self.max_duration)
+            hi = bisect.bisect_left(self.starts, t + duration)
+            blocking = [self.ends[i] for i in range(lo, hi) if self.ends[i] > t]
+            if blocking:
+                t = max(blocking)
+            else:
+                slots.append(t)
+                t = t + duration
+        return slots
+
+
+class ScheduleIndex:
+    # 트레이너별 예약을 처음 조회할 때와 RELOAD_INTERVAL이 지났을 때 불러오고, 그 사이에는 삽입 시점에 갱신
+
+    def __init__(self):
+        self.trainers = {}
+        self._lock = threading.Lock()
+
+    def _load(self, supabase, trainer_id):
+        schedule = TrainerSchedule()
+        last_id = None
+        while True:
+            query = supabase.table("pt_reservations")\
+                .select("reservation_id, member_id, reservation_start, reservation_end")\
+                .eq("trainer_id", trainer_id)\
+                .order("reservation_id")\
+                .limit(FETCH_BATCH)
+            if last_id is not None:
+                query = query.gt("reservation_id", last_id)
+            batch = query.execute().data or []
+            for row in batch:
+                schedule.add(row["reservation_start"], row["reservation_end"], row)
+            if len(batch) < FETCH_BATCH:
+                return schedule
+            last_id = batch[-1]["reservation_id"]
+
+    def get(self, supabase, trainer_id):
+        with self._lock:
+            schedule = self.trainers.setdefault(trainer_id, TrainerSchedule())
+        # 재적재는 그 트레이너의 lock 안에서 같은 객체를 갱신한다
+        # (객체를 바꾸면 진행 중인 예약의 확인-삽입 잠금이 갈라진다)
+        with schedule.lock:
+            if schedule.loaded_at is None or monotonic() - schedule.loaded_at > RELOAD_INTERVAL:
+                schedule.replace(self._load(supabase, trainer_id))
+        return schedule
+
+    def reset(self, trainer_id=None):
+        with self._lock:
+            if trainer_id is None:
+                self.trainers.clear()
+            else:
+                self.trainers.pop(trainer_id, None)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_schedule_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ScheduleIndex()
+        return _index
@@ -0,0 +1,5 @@
+# FitnessCenterManagement 모듈은 "modules.xxx" 로 import 하므로 이 폴더의 상위(앱 루트)를 경로에 추가
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
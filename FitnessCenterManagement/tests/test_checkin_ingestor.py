@@ -0,0 +1,105 @@
+# modules.checkin_ingestor: 묶음 거절, 재시작 복원, 종료 시 spool
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from modules.checkin_ingestor import BufferFullError, CheckinIngestor
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_full_buffer_rejects_whole_batch_without_side_effects():
+    ingestor = CheckinIngestor(lambda rows: None, max_buffer=2)
+
+    async def scenario():
+        ingestor.record_many([(1, "check_in", None), (1, "check_out", None)])
+        before = (dict(ingestor.open_sessions), list(ingestor.buffer), dict(ingestor.stats))
+        with pytest.raises(BufferFullError):
+            ingestor.record_many([(2, "check_in", None), (2, "check_out", None), (3, "check_in", None)])
+        assert (dict(ingestor.open_sessions), list(ingestor.buffer), dict(ingestor.stats)) == before
+
+    run(scenario())
+
+
+def test_open_visits_survive_restart_and_are_closed_by_update():
+    db = []   # gym_logs 대용
+
+    def flush_rows(rows):
+        for row in rows:
+            if "log_id" in row:
+                next(r for r in db if r["log_id"] == row["log_id"]).update(row)
+            else:
+                db.append({**row, "log_id": len(db) + 1})
+
+    def load_open(since):
+        return [r for r in db if r["check_out_time"] is None
+                and datetime.fromisoformat(r["check_in_time"]) >= since]
+
+    async def first_process():
+        ingestor = CheckinIngestor(flush_rows, load_open=load_open)
+        ingestor.record(7, "check_in", datetime.now() - timedelta(minutes=30))
+        await ingestor.stop()
+
+    async def second_process():
+        ingestor = CheckinIngestor(flush_rows, load_open=load_open)
+        assert await ingestor.restore() == 1
+        assert ingestor.occupancy()["occupancy"] == 1
+        assert ingestor.record(7, "check_out") == "ok"
+        assert ingestor.occupancy()["occupancy"] == 0
+        await ingestor.stop()
+
+    run(first_process())
+    run(second_process())
+    assert len(db) == 1
+    assert db[0]["check_out_time"] is not None
+
+
+def test_failed_final_flush_is_spooled_and_restored(tmp_path, monkeypatch):
+    monkeypatch.setattr("modules.checkin_ingestor.FINAL_FLUSH_RETRIES", 1)
+    spool = tmp_path / "spool.json"
+    saved = []
+
+    def broken(rows):
+        raise OSError("db down")
+
+    async def first_process():
+        ingestor = CheckinIngestor(broken, spool_path=str(spool))
+        ingestor.record(1, "check_in")
+        ingestor.record(1, "check_out")
+        ingestor.record(2, "check_in")
+        await ingestor.stop()
+
+    async def second_process():
+        ingestor = CheckinIngestor(saved.extend, spool_path=str(spool))
+        await ingestor.restore()
+        # 완료된 방문은 다시 저장 대기, 퇴장 전이던 회원은 안에 있는 것으로 복원
+        assert len(ingestor.buffer) == 1
+        assert set(ingestor.open_sessions) == {2}
+        await ingestor.flush()
+
+    run(first_process())
+    assert len(json.loads(spool.read_text())) == 2
+    run(second_process())
+    assert not spool.exists()
+    assert [r["member_id"] for r in saved] == [1]
+
+
+def test_occupancy_is_rebuilt_from_open_gym_logs():
+    now = datetime.now()
+    rows = [
+        {"log_id": 1, "member_id": 1, "check_in_time": (now - timedelta(hours=1)).isoformat()},
+        {"log_id": 2, "member_id": 2, "check_in_time": (now - timedelta(minutes=5)).isoformat()},
+        # 같은 회원의 더 이른 미퇴장 기록은 한 명으로 센다
+        {"log_id": 3, "member_id": 2, "check_in_time": (now - timedelta(hours=2)).isoformat()},
+    ]
+    ingestor = CheckinIngestor(lambda rows: None, load_open=lambda since: rows)
+
+    run(ingestor.restore())
+    occupancy = ingestor.occupancy()
+    assert occupancy["occupancy"] == 2
+    assert occupancy["restored_at"] is not None
+    assert ingestor.open_sessions[2][1] == 2
@@ -0,0 +1,159 @@
+# modules.mail_sender.BulkMailer 를 로컬 가짜 SMTP 서버로 검사
+# 연결 재사용, 4xx 재시도, 5xx 실패, 로그인 실패 시 전체 중단, 예상 밖 오류 처리
+import base64
+import socketserver
+import threading
+
+import pytest
+
+from modules import mail_sender
+from modules.mail_sender import BulkMailer
+
+PASSWORD = "secret"
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    # EHLO/AUTH PLAIN/MAIL/RCPT/DATA/QUIT 만 흉내 낸다
+    # 수신자 주소의 앞부분으로 응답을 고른다: temp=처음 한 번 451, perm=항상 550
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 fake ESMTP")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command == "EHLO":
+                self.reply("250-fake")
+                self.reply("250 AUTH PLAIN")
+            elif command == "AUTH":
+                _, user, password = base64.b64decode(line.split()[2]).decode().split("\0")
+                with server.lock:
+                    server.logins += 1
+                self.reply("235 ok" if password == PASSWORD else "535 bad credentials")
+            elif command in ("MAIL", "RSET", "NOOP"):
+                self.reply("250 ok")
+            elif command == "RCPT":
+                recipient = line.split("<", 1)[1].rstrip(">")
+                self.reply(self.rcpt_reply(recipient))
+            elif command == "DATA":
+                self.reply("354 go ahead")
+                lines = []
+                while True:
+                    data = self.rfile.readline().decode().rstrip("\r\n")
+                    if data == ".":
+                        break
+                    lines.append(data)
+                with server.lock:
+                    server.delivered.append("\n".join(lines))
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 not implemented")
+
+    def rcpt_reply(self, recipient):
+        server = self.server
+        with server.lock:
+            server.rcpt_counts[recipient] = server.rcpt_counts.get(recipient, 0) + 1
+            count = server.rcpt_counts[recipient]
+        if recipient.startswith("perm"):
+            return "550 no such user"
+        if recipient.startswith("temp") and count == 1:
+            return "451 try again later"
+        return "250 ok"
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins = 0
+        self.rcpt_counts = {}
+        self.delivered = []
+
+
+@pytest.fixture
+def smtp():
+    server = FakeSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_mailer(smtp, password=PASSWORD, workers=1):
+    return BulkMailer("127.0.0.1", smtp.server_address[1], "gym@example.com", password,
+                      use_tls=False, workers=workers, max_retries=3, backoff=0, timeout=5)
+
+
+def test_reuses_one_connection_for_many_messages(smtp):
+    mailer = make_mailer(smtp)
+    results = mailer.send_bulk([(f"member{i}@example.com", "만료 안내", "본문") for i in range(5)])
+    mailer.close()
+
+    assert all(r["ok"] and r["attempts"] == 1 for r in results)
+    assert len(smtp.delivered) == 5
+    assert (smtp.connections, smtp.logins) == (1, 1)
+
+
+def test_retries_4xx_and_gives_up_on_5xx(smtp):
+    mailer = make_mailer(smtp)
+    temp, perm = mailer.send_bulk([
+        ("temp@example.com", "만료 안내", "본문"),
+        ("perm@example.com", "만료 안내", "본문"),
+    ])
+    mailer.close()
+
+    assert temp["ok"] and temp["attempts"] == 2
+    assert not perm["ok"] and perm["attempts"] == 1 and "550" in perm["error"]
+    assert smtp.rcpt_counts == {"temp@example.com": 2, "perm@example.com": 1}
+    # 거절 뒤에도 같은 연결을 계속 쓴다
+    assert smtp.connections == 1
+
+
+def test_auth_error_stops_the_mailer_until_password_changes(smtp):
+    mailer = make_mailer(smtp, password="wrong")
+    results = mailer.send_bulk([(f"member{i}@example.com", "만료 안내", "본문") for i in range(3)])
+
+    assert not any(r["ok"] for r in results)
+    assert all("535" in r["error"] for r in results)
+    # 첫 메일에서 로그인에 실패하면 남은 메일은 다시 로그인하지 않는다
+    assert smtp.logins == 1
+    assert smtp.rcpt_counts == {}
+
+    mailer.set_password(PASSWORD)
+    assert mailer.send_bulk([("member0@example.com", "만료 안내", "본문")])[0]["ok"]
+    mailer.close()
+    assert smtp.logins == 2
+
+
+def test_unexpected_error_resolves_future_and_keeps_worker_alive(smtp, monkeypatch):
+    mailer = make_mailer(smtp)
+    real_build = mail_sender.build_message
+
+    def build_message(email_sender, recipient, subject, body):
+        if recipient == "broken@example.com":
+            raise ValueError("bad header")
+        return real_build(email_sender, recipient, subject, body)
+
+    monkeypatch.setattr(mail_sender, "build_message", build_message)
+    broken, ok = mailer.send_bulk([
+        ("broken@example.com", "만료 안내", "본문"),
+        ("member@example.com", "만료 안내", "본문"),
+    ])
+    mailer.close()
+
+    assert not broken["ok"] and "ValueError" in broken["error"]
+    assert ok["ok"]
@@ -0,0 +1,80 @@
+# modules.schedule_index: 겹침 조회와 주기적 재적재
+from modules import schedule_index
+from modules.schedule_index import ScheduleIndex
+
+
+class FakeQuery:
+    # ScheduleIndex._load 가 쓰는 eq/order/limit/gt 만 흉내 낸다
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.size = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda r: r[column] == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda r: r[column] > value)
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows if all(f(r) for f in self.filters)][:self.size]
+        return type("Response", (), {"data": rows})
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.reservations = []
+        self.loads = 0
+
+    def table(self, name):
+        self.loads += 1
+        return FakeQuery(self.reservations)
+
+    def book(self, trainer_id, start, end):
+        self.reservations.append({
+            "reservation_id": len(self.reservations) + 1, "trainer_id": trainer_id, "member_id": 1,
+            "reservation_start": start, "reservation_end": end,
+        })
+
+
+def test_overlapping_includes_partial_overlaps_only():
+    db = FakeSupabase()
+    db.book(7, "2030-01-01T10:00:00", "2030-01-01T11:00:00")
+    db.book(7, "2030-01-01T13:00:00", "2030-01-01T14:00:00")
+    db.book(8, "2030-01-01T10:00:00", "2030-01-01T11:00:00")
+    schedule = ScheduleIndex().get(db, 7)
+
+    assert len(schedule) == 2
+    assert [r["reservation_id"] for r in schedule.overlapping("2030-01-01T10:30:00", "2030-01-01T13:30:00")] == [1, 2]
+    # 끝나는 시각에 시작하는 예약은 겹치지 않는다
+    assert schedule.overlapping("2030-01-01T11:00:00", "2030-01-01T13:00:00") == []
+
+
+def test_reloads_after_interval_in_place(monkeypatch):
+    db = FakeSupabase()
+    index = ScheduleIndex()
+    schedule = index.get(db, 7)
+    lock = schedule.lock
+
+    # 다른 프로세스가 넣은 예약은 재적재 주기 전에는 보이지 않는다
+    db.book(7, "2030-01-01T10:00:00", "2030-01-01T11:00:00")
+    assert len(index.get(db, 7)) == 0
+    assert db.loads == 1
+
+    monkeypatch.setattr(schedule_index, "RELOAD_INTERVAL", -1)
+    reloaded = index.get(db, 7)
+    assert len(reloaded) == 1
+    # 같은 객체/lock을 갱신해야 진행 중인 예약의 잠금이 유지된다
+    assert reloaded is schedule and reloaded.lock is lock
@@ -0,0 +1,96 @@
+# 의존 구문 시각화 벤치마크: 호마다 ax.plot 하던 기존 방식 vs LineCollection 한 번 (nlp_render)
+#
+# 두 효과를 따로 잰다
+# - 벡터화: 같은 Figure 크기/저장 설정(st.pyplot 기본값 dpi=200, bbox_inches="tight")에서
+#           기존 루프 vs build_figure
+# - 해상도 제한: render_png 기본값 (폭 MAX_IMAGE_WIDTH px 또는 단어당 MIN_WORD_WIDTH px 제한 + 빠른 PNG 압축)
+#
+# 실행: python benchmarks/bench_arc_render.py [반복 횟수]
+import io
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nlp_render import build_figure, colors_30, render_png  # noqa: E402
+
+# 변경 전 st.pyplot(fig)가 PNG를 만들 때 쓰는 savefig 설정
+ST_PYPLOT_SAVEFIG = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+
+
+def make_sentence(n_words, seed=0):
+    # 임의의 트리: 0번이 ROOT, 나머지는 앞쪽 단어 중 하나에 의존
+    rng = np.random.default_rng(seed)
+    word_list = [f"woord{i}" for i in range(n_words)]
+    arcs = [(int(rng.integers(0, dep)), dep) if rng.random() < 0.5 else (dep, int(rng.integers(0, dep)))
+            for dep in range(1, n_words)]
+    relations = ["root"] + ["nsubj"] * (n_words - 1)
+    return word_list, arcs, relations
+
+
+def render_legacy(word_list, arcs, relations):
+    # 변경 전 nlp_front.py 의 그리기 루프 (st.pyplot과 같은 설정으로 PNG 저장)
+    def get_color_by_distance(dist, colors=colors_30):
+        dist = min(max(dist, 1), len(colors))
+        return colors[dist - 1]
+
+    fig, ax = plt.subplots(figsize=(len(word_list) * 2.0, 3))
+    if len(word_list) > 15:
+        fig.set_size_inches(len(word_list) * 2.0, 6)
+    ax.set_xticks(list(range(len(word_list))))
+    ax.set_xticklabels(word_list, fontsize=14)
+    ax.set_yticks([])
+    ax.set_ylim(0, max(4, max(abs(dep - head) for head, dep in arcs) + 1))
+    ax.set_xlim(-1, len(word_list))
+    for head, dep in arcs:
+        x_vals = np.linspace(min(head, dep), max(head, dep), 500)
+        amplitude = max(abs(dep - head), 1)
+        height = amplitude * np.abs(np.sin(np.pi * (x_vals - min(head, dep)) / (max(head, dep) - min(head, dep))))
+        color = 'red' if relations[head] == "root" else get_color_by_distance(amplitude)
+        ax.plot(x_vals, height, color=color, linestyle='--' if head < dep else '-', linewidth=2)
+    ax.set_title("Dependency Structure", fontsize=16)
+    buf = io.BytesIO()
+    fig.savefig(buf, **ST_PYPLOT_SAVEFIG)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def render_vectorized_same_raster(word_list, arcs, relations):
+    # 벡터화만의 효과: build_figure를 기존과 같은 설정으로 저장
+    buf = io.BytesIO()
+    build_figure(word_list, arcs, relations).savefig(buf, **ST_PYPLOT_SAVEFIG)
+    return buf.getvalue()
+
+
+def best_of(fn, args, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'words':>5} {'legacy ms':>10} {'vector ms':>10} {'벡터화':>7} {'render_png ms':>14} {'전체':>7}")
+    for n_words in (10, 30, 60):
+        args = make_sentence(n_words)
+        legacy = best_of(render_legacy, args, repeat)
+        vector = best_of(render_vectorized_same_raster, args, repeat)
+        capped = best_of(render_png, args, repeat)
+        print(f"{n_words:>5} {legacy * 1000:>10.1f} {vector * 1000:>10.1f} {legacy / vector:>6.1f}x "
+              f"{capped * 1000:>14.1f} {legacy / capped:>6.1f}x")
+    print("vector: 같은 해상도에서 LineCollection만 바꾼 효과 / render_png: 폭 제한과 빠른 PNG 압축까지 포함")
+    print("st.cache_data 적중 시에는 PNG 바이트를 그대로 재사용하므로 다시 그리지 않는다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# RSS 요약 HTML 정리 단계 벤치마크: 경량 태그 제거(html_to_text) vs BeautifulSoup
+#
+# 실행: python benchmarks/bench_html_to_text.py [반복 횟수]
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nos_crawler.text import html_to_text, html_to_text_bs4  # noqa: E402
+
+FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "rss_summaries.txt")
+
+
+def load_corpus():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    corpus = load_corpus()
+
+    mismatches = [html for html in corpus if html_to_text(html) != html_to_text_bs4(html)]
+    if mismatches:
+        print(f"출력 불일치 {len(mismatches)}건:")
+        for html in mismatches:
+            print(f"  {html!r}\n    fast: {html_to_text(html)!r}\n    bs4 : {html_to_text_bs4(html)!r}")
+
+    n = len(corpus) * repeat
+    fast = min(timeit.repeat(lambda: [html_to_text(h) for h in corpus], number=repeat, repeat=3))
+    bs4 = min(timeit.repeat(lambda: [html_to_text_bs4(h) for h in corpus], number=repeat, repeat=3))
+    print(f"fragments: {n}")
+    print(f"html_to_text : {fast / n * 1e6:8.1f} us/item")
+    print(f"BeautifulSoup: {bs4 / n * 1e6:8.1f} us/item")
+    print(f"speedup      : {bs4 / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
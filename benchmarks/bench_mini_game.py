@@ -0,0 +1,80 @@
+# pygame_mini_game 프레임 시간 벤치마크 (화면 없이 SDL dummy 드라이버로 실행)
+#
+# ScriptedPlayer가 게임 시간 기준으로 방향키를 넣고, 같은 --seed면 --fps와 상관없이 같은 문제/입력/결과가 나온다.
+# 미니게임 루프의 프레임마다 갱신(입력/판정)과 그리기 시간을 재서 p50/p95/p99를 보여준다.
+#
+# 실행: python benchmarks/bench_mini_game.py [--rounds N] [--seed S] [--fps F] [--json 파일]
+#       python benchmarks/bench_mini_game.py --games 1   (시작 화면 ~ 승패 화면까지 main() 전체)
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame_mini_game as game  # noqa: E402
+
+
+def run_rounds(rounds):
+    # main()의 라운드 사이 대기 화면 없이 미니게임만 연달아 실행
+    game.hero_hp, game.max_hero_hp = 3, 3
+    game.enemy_hp, game.max_hp = 10, 10
+    for round_num in range(1, rounds + 1):
+        game.direction_mini_game(round_num)
+
+
+def run_games():
+    # 마지막 판이 끝나면 ScriptedPlayer가 N을 눌러 main()이 sys.exit() 한다
+    try:
+        game.main()
+    except SystemExit:
+        pass
+
+
+def print_report(report, wall_s):
+    print(f"프레임 {report['frames']}개 · 라운드 {report['rounds']}개 · {wall_s:.1f}초")
+    print(f"{'':<8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name in ("update", "render", "frame"):
+        row = report[name]
+        print(f"{name:<8} {row['p50']:>8.3f} {row['p95']:>8.3f} {row['p99']:>8.3f} {row['max']:>8.3f}")
+    print("결과:", " ".join(f"{correct}/{total}" for correct, total in report["results"]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5, help="미니게임 라운드 수")
+    parser.add_argument("--games", type=int, default=0, help="0이 아니면 main() 전체를 이 판 수만큼 실행")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fps", type=int, default=game.FPS, help="0이면 프레임 제한 없음")
+    parser.add_argument("--accuracy", type=float, default=0.95, help="키마다 맞게 누를 확률")
+    parser.add_argument("--ms-per-key", type=int, default=40, help="자동 입력 키 사이 게임 시간(ms)")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    game.init_game(headless=True)
+    game.FPS = args.fps
+    game.input_player = game.ScriptedPlayer(
+        seed=args.seed, ms_per_key=args.ms_per_key, accuracy=args.accuracy, games=args.games or 1,
+    )
+    game.frame_stats = game.FrameStats()
+
+    started = time.perf_counter()
+    if args.games:
+        run_games()
+    else:
+        run_rounds(args.rounds)
+    wall_s = time.perf_counter() - started
+
+    report = game.frame_stats.report()
+    print_report(report, wall_s)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**report, "seed": args.seed, "fps": args.fps, "wall_s": wall_s}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Streamlit 앱 시작 시 import 비용 측정 (python -X importtime 기반)
+#
+# 각 항목을 새 인터프리터에서 import 하고 최상위 모듈의 누적 시간을 합산한다.
+# 인터프리터 기동(site 등)과 streamlit 자체 비용은 모든 페이지에 공통이므로 빼서 보여준다.
+# "변경 전" 항목은 예전에 모듈 최상단에서 불러오던 라이브러리를 그대로 나열한 것이다.
+#
+# 실행: python benchmarks/importtime.py [반복 횟수] [--top N]
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FITNESS = os.path.join(ROOT, "FitnessCenterManagement")
+
+# (이름, 작업 디렉터리, import 할 모듈)
+TARGETS = [
+    ("streamlit (공통)", ROOT, ["streamlit"]),
+    ("nlp_front 시작 - 변경 전", ROOT, ["streamlit", "pandas", "matplotlib.pyplot", "numpy", "requests"]),
+    ("nlp_front 시작", ROOT, ["streamlit", "nlp_client"]),
+    ("nlp_front 첫 결과 표시", ROOT, ["streamlit", "nlp_client", "pandas", "nlp_render"]),
+    ("main_fitness 시작 - 변경 전", FITNESS, [
+        "streamlit", "supabase", "dotenv", "pandas", "plotly.express", "modules.member_trainer_management",
+        "modules.reservation_management", "modules.emails_and_reports", "modules.dashboard",
+    ]),
+    ("main_fitness 현황 대시보드", FITNESS, ["streamlit", "supabase", "dotenv", "modules.dashboard"]),
+    ("main_fitness 회원 및 트레이너 관리", FITNESS, [
+        "streamlit", "supabase", "dotenv", "modules.member_trainer_management",
+    ]),
+    ("main_fitness 이메일 발송 및 통계", FITNESS, [
+        "streamlit", "supabase", "dotenv", "modules.emails_and_reports",
+    ]),
+]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def measure(cwd, modules):
+    # 최상위(들여쓰기 없는) 모듈의 누적 시간 합계(us)와 모듈별 누적 시간
+    code = "; ".join(f"import {m}" for m in modules) or "pass"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": cwd},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    top = {}
+    for self_us, cumulative_us, indent, name in LINE.findall(proc.stderr):
+        if not indent:
+            top[name] = int(cumulative_us)
+    return sum(top.values()), top
+
+
+def main():
+    args = sys.argv[1:]
+    top_n = 0
+    if "--top" in args:
+        i = args.index("--top")
+        top_n = int(args[i + 1])
+        del args[i:i + 2]
+    repeat = int(args[0]) if args else 5
+
+    # 아무것도 import 하지 않을 때 불리는 모듈 = 인터프리터 기동 비용
+    startup = set(measure(ROOT, [])[1])
+    common = startup | {"streamlit"}
+    print(f"{'항목':<36} {'전체 ms':>9} {'공통 제외 ms':>13}")
+    for name, cwd, modules in TARGETS:
+        total, top = min((measure(cwd, modules) for _ in range(repeat)), key=lambda r: r[0])
+        own = sum(us for module, us in top.items() if module not in common)
+        print(f"{name:<36} {total / 1000:>9.1f} {own / 1000:>13.1f}")
+        if top_n:
+            for module, us in sorted(top.items(), key=lambda kv: -kv[1])[:top_n]:
+                print(f"    {module:<32} {us / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# nlp_client.py
+# 의존 구문 분석 API 호출 + 결과 캐시
+#
+# - 메모리: 정규화한 문장을 키로 하는 LRU + TTL
+# - 디스크: SQLite 파일에 저장해 재시작 후에도 같은 문장은 다시 요청하지 않음
+# - 같은 문장이 동시에 들어오면 먼저 온 요청 하나만 API를 부르고 나머지는 그 결과를 기다린다
+import os
+import re
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://first.nstaaanp.store/analyze"
+API_TIMEOUT = 5
+CACHE_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".nlp_cache.sqlite")
+MEMORY_CACHE_SIZE = 512
+MEMORY_TTL = 60 * 60
+DISK_TTL = 7 * 24 * 60 * 60
+DISK_MAX_ROWS = 20000
+# 일괄 분석 시 동시에 보내는 요청 수 (세션의 연결 풀 크기도 같게 맞춘다)
+BATCH_WORKERS = 8
+# 문장 끝 부호(+닫는 따옴표/괄호 최대 2개) 뒤 공백에서만 자른다. 닫는 문자는 앞 문장에 남긴다
+# (약어 "bijv. de" 처럼 뒤가 소문자면 자르지 않음)
+SENTENCE_END = re.compile(
+    r"(?:(?<=[.!?…])|(?<=[.!?…][\"')\]])|(?<=[.!?…][\"')\]]{2}))\s+(?=[\"'(\[]?[A-Z0-9À-Ý'])"
+)
+
+
+class AnalysisError(Exception):
+    pass
+
+
+def split_sentences(text: str):
+    sentences = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        sentences.extend(normalize(s) for s in SENTENCE_END.split(paragraph))
+    return [s for s in sentences if s]
+
+
+def make_session(pool_size: int = BATCH_WORKERS) -> requests.Session:
+    # 동시 요청이 매번 새 TCP/TLS 연결을 맺지 않도록 연결을 재사용
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def normalize(sentence: str) -> str:
+    # 앞뒤 공백 제거 + 연속 공백을 하나로 (대소문자는 분석 결과에 영향을 주므로 유지)
+    return " ".join(sentence.split())
+
+
+class DiskCache:
+    def __init__(self, path: str = CACHE_DB_PATH, ttl: float = DISK_TTL, max_rows: int = DISK_MAX_ROWS):
+        self.path = path
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS parses (key TEXT PRIMARY KEY, value TEXT, created REAL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_parses_created ON parses(created)")
+        self.prune()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        row = self._conn().execute(
+            "SELECT value FROM parses WHERE key = ? AND created > ?", (key, time.time() - self.ttl)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: dict):
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO parses (key, value, created) VALUES (?, ?, ?)",
+                         (key, json.dumps(value, ensure_ascii=False), time.time()))
+
+    def prune(self):
+        # 만료된 행과 max_rows를 넘는 오래된 행 삭제 (시작할 때 한 번)
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM parses WHERE created <= ?", (time.time() - self.ttl,))
+            conn.execute(
+                "DELETE FROM parses WHERE key IN (SELECT key FROM parses ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            )
+
+
+class ParseClient:
+    def __init__(self, api_url: str = API_URL, timeout: float = API_TIMEOUT, maxsize: int = MEMORY_CACHE_SIZE,
+                 ttl: float = MEMORY_TTL, disk: DiskCache = None, session: requests.Session = None):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk = disk
+        self.session = session or make_session()
+        self.memory = OrderedDict()   # key -> (저장 시각, 결과)
+        self.in_flight = {}           # key -> Future
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def _memory_get(self, key):
+        entry = self.memory.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self.memory[key]
+            return None
+        self.memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key, value):
+        self.memory[key] = (time.monotonic(), value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def _request(self, sentence: str) -> dict:
+        resp = self.session.post(self.api_url, json={"text": sentence}, timeout=self.timeout)
+        if resp.status_code != 200:
+            raise AnalysisError(f"analyze API returned {resp.status_code}")
+        return resp.json()
+
+    def analyze(self, sentence: str):
+        # (결과, 출처) 반환. 출처: "memory" | "disk" | "api" | "coalesced"
+        key = normalize(sentence)
+        with self._lock:
+            value = self._memory_get(key)
+            if value is not None:
+                self.stats["memory_hits"] += 1
+                return value, "memory"
+            future = self.in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.in_flight[key] = future
+            else:
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            return future.result(), "coalesced"
+
+        source = "api"
+        value = self._disk_get(key)
+        try:
+            if value is not None:
+                source = "disk"
+            else:
+                value = self._request(key)
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+                del self.in_flight[key]
+            # 실패는 캐시하지 않고 기다리던 요청에도 같은 예외를 전달
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self.stats["disk_hits" if source == "disk" else "misses"] += 1
+            self._memory_set(key, value)
+            del self.in_flight[key]
+        future.set_result(value)
+        if source == "api":
+            self._disk_set(key, value)
+        return value, source
+
+    # 디스크 캐시는 보조 수단이라 읽기/쓰기 실패(DB 잠김, 디스크 가득 참 등)는 기록만 하고
+    # API 결과를 오류로 바꾸지 않는다
+    def _disk_get(self, key):
+        if not self.disk:
+            return None
+        try:
+            return self.disk.get(key)
+        except Exception:
+            logger.warning("disk cache read failed", exc_info=True)
+            return None
+
+    def _disk_set(self, key, value):
+        if not self.disk:
+            return
+        try:
+            self.disk.set(key, value)
+        except Exception:
+            logger.warning("disk cache write failed", exc_info=True)
+
+    def analyze_many(self, sentences, max_workers: int = BATCH_WORKERS):
+        # 끝나는 순서대로 (순번, 결과, 출처, 오류) 를 내보낸다. 같은 문장은 캐시/합류로 한 번만 호출
+        def run(index, sentence):
+            try:
+                value, source = self.analyze(sentence)
+                return index, value, source, None
+            except Exception as e:
+                return index, None, None, e
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [pool.submit(run, i, s) for i, s in enumerate(sentences)]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # 화면이 다시 실행돼 중간에 멈추면 아직 시작하지 않은 요청은 취소
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"] + self.stats["coalesced"]
+            hits = lookups - self.stats["misses"]
+            return {**self.stats, "cached": len(self.memory), "hit_rate": hits / lookups if lookups else 0.0}
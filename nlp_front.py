@@ -1,91 +1,167 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
-import requests
-
-API_URL = "https://first.nstaaanp.store/analyze"
+import time
+from nlp_client import AnalysisError, DiskCache, ParseClient, split_sentences
+# pandas, matplotlib(nlp_render)은 첫 분석 결과를 그릴 때 불러와 입력 화면이 먼저 뜨도록 한다
 
 st.set_page_config(page_title="네덜란드어 의존 구문 분석기", layout="wide")
 st.title("🇳🇱 네덜란드어 의존 구문 분석기")
 
-user_input = st.text_area("네덜란드어 문장을 한 개만 입력하세요 (최대 300자).", max_chars=300)
+@st.cache_resource
+def get_parse_client():
+    # 모든 세션이 하나의 캐시를 공유해야 같은 예문을 동시에 보내도 API 호출이 한 번으로 끝난다
+    return ParseClient(disk=DiskCache())
+
+client = get_parse_client()
+
+CACHE_SOURCE_LABELS = {
+    "api": "API 호출",
+    "memory": "메모리 캐시",
+    "disk": "디스크 캐시",
+    "coalesced": "동시 요청 결과 공유",
+}
+
+def show_cache_stats():
+    stats = client.snapshot()
+    with st.sidebar:
+        st.markdown("**분석 결과 캐시**")
+        st.metric("적중률", f"{stats['hit_rate']:.0%}")
+        st.caption(
+            f"메모리 {stats['memory_hits']} · 디스크 {stats['disk_hits']} · 공유 {stats['coalesced']} · "
+            f"미스 {stats['misses']} · 오류 {stats['errors']} (메모리 보관 {stats['cached']}건)"
+        )
+
+MAX_SENTENCE_CHARS = 300
+MAX_BATCH_CHARS = 20000
+MAX_BATCH_SENTENCES = 100
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_arc_png(word_list: tuple, arcs: tuple, relations: tuple) -> bytes:
+    # 같은 문장은 다시 실행될 때 그림을 새로 그리지 않고 PNG 바이트를 재사용
+    from nlp_render import render_png
+    return render_png(list(word_list), arcs, relations)
+
+def render_table(sentence_data):
+    import pandas as pd
+    df = pd.DataFrame(sentence_data)
+    df.index = df.index + 1
+    st.dataframe(df)
+    return df
+
+def render_arcs(word_list, arcs, df):
+    relations = tuple(df["의존관계코드"]) if "의존관계코드" in df.columns else ()
+    arcs = tuple(tuple(arc) for arc in arcs)
+    started = time.perf_counter()
+    if renderer == "인터랙티브 (Plotly)":
+        from nlp_render import render_plotly
+        st.plotly_chart(render_plotly(word_list, arcs, relations))
+    else:
+        st.image(cached_arc_png(tuple(word_list), arcs, relations))
+    st.caption(f"시각화 {(time.perf_counter() - started) * 1000:.0f} ms")
+
+LEGEND = """
+**범례**  
+- 실선 : 왼쪽   → 오른쪽  
+- 점선 : 오른쪽 → 왼쪽  
+- ROOT에 의존한 단어는 빨간색 선
+"""
 
-if st.button("분석"):
+def render_result(result, show_sentence=True):
+    if show_sentence:
+        st.subheader(f"문장: {result['sentence']}")
+    df = render_table(result["sentence_data"])
+    # ===== 시각화 =====
+    try:
+        if result["arcs"]:
+            st.markdown("**의존 구문 시각화**")
+            render_arcs(result["word_list"], result["arcs"], df)
+        else:
+            st.error("오류가 발생했습니다. 잠시 후 다시 시도해 주세요.")
+    except Exception:
+        st.error("오류가 발생했습니다. 잠시 후 다시 시도해 주세요.")
+
+def analyze_single(user_input):
     if len(user_input.strip()) == 0:      #공백 확인
         st.error("문장을 입력해주세요.")
-    elif len(user_input) > 300:      # 길이 이중 확인
+        return
+    if len(user_input) > MAX_SENTENCE_CHARS:      # 길이 이중 확인
         st.error("300자 이하로 입력해주세요.")
-    else:
-        with st.spinner("분석 중..."):
-            try:
-                resp = requests.post(API_URL, json={"text": user_input}, timeout=5)
-                if resp.status_code == 200:
-                    result = resp.json()
-                    sentence = result["sentence"]
-                    word_list = result["word_list"]
-                    sentence_data = result["sentence_data"]
-                    arcs = result["arcs"]
-                    st.subheader(f"문장: {sentence}")
-
-                    df = pd.DataFrame(sentence_data)
-                    df.index = df.index + 1
-                    st.dataframe(df)
-                else:
-                    st.error("분석 중 문제가 발생했습니다. 잠시 후 다시 시도해 주세요.")
-            except Exception:
-                st.error("오류가 발생했습니다. 잠시 후 다시 시도해 주세요.")
-
-            # ===== 시각화 =====
-            try:
-                if arcs:
-                    st.markdown("**의존 구문 시각화**")
-                    base_colors = plt.get_cmap('tab20').colors  # 30가지 색 추출
-                    extra_colors = [
-                        (0.9, 0.1, 0.1), (0.1, 0.9, 0.1), (0.1, 0.1, 0.9),
-                        (0.9, 0.5, 0.1), (0.5, 0.1, 0.9), (0.1, 0.9, 0.5),
-                        (0.6, 0.2, 0.2), (0.2, 0.6, 0.2), (0.2, 0.2, 0.6),
-                        (0.8, 0.3, 0.4)
-                    ]
-                    colors_30 = list(base_colors) + extra_colors
-
-                    def get_color_by_distance(dist, colors=colors_30):
-                        if dist < 1:
-                            dist = 1
-                        if dist > len(colors):
-                            dist = len(colors)
-                        return colors[dist - 1]
-
-                    fig, ax = plt.subplots(figsize=(len(word_list) * 2.0, 3))       # 시각화 매트릭스 생성
-                    if len(word_list) > 15:                                         # 15 단어 이상은 높이를 두배로 변경
-                        fig.set_size_inches(len(word_list) * 2.0, 6)
-                    positions = list(range(len(word_list)))
-                    ax.set_xticks(positions)
-                    ax.set_xticklabels(word_list, fontsize=14)
-                    ax.set_yticks([])
-                    ax.set_ylim(0, max(4, max(abs(dep - head) for head, dep in arcs) + 1))
-                    ax.set_xlim(-1, len(word_list))
-
-                    for head, dep in arcs:
-                        x_vals = np.linspace(min(head, dep), max(head, dep), 500)
-                        amplitude = abs(dep - head)
-                        if amplitude == 0:
-                            amplitude = 1
-                        height = amplitude * np.abs(np.sin(np.pi * (x_vals - min(head, dep)) / (max(head, dep) - min(head, dep))))
-                        color = 'red' if df.loc[head+1, "의존관계코드"] == "root" else get_color_by_distance(amplitude)
-                        linestyle = '--' if head < dep else '-'
-                        ax.plot(x_vals, height, color=color, linestyle=linestyle, linewidth=2)
-
-                    ax.set_title("Dependency Structure", fontsize=16)
-                    st.pyplot(fig)
-                    st.markdown("""
-                    **범례**  
-                    - 실선 : 왼쪽   → 오른쪽  
-                    - 점선 : 오른쪽 → 왼쪽  
-                    - ROOT에 의존한 단어는 빨간색 선
-                    """)
-                else:
-                    st.error("오류가 발생했습니다. 잠시 후 다시 시도해 주세요.")
-            except Exception:
-                st.error("오류가 발생했습니다. 잠시 후 다시 시도해 주세요.")
+        return
+    with st.spinner("분석 중..."):
+        try:
+            started = time.perf_counter()
+            result, source = client.analyze(user_input)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        except AnalysisError:
+            st.error("분석 중 문제가 발생했습니다. 잠시 후 다시 시도해 주세요.")
+            return
+        except Exception:
+            st.error("오류가 발생했습니다. 잠시 후 다시 시도해 주세요.")
+            return
+        st.subheader(f"문장: {result['sentence']}")
+        st.caption(f"{CACHE_SOURCE_LABELS[source]} · {elapsed_ms:.0f} ms")
+        render_result(result, show_sentence=False)
+        st.markdown(LEGEND)
+
+def analyze_batch(text):
+    sentences = split_sentences(text)
+    if not sentences:
+        st.error("문장을 입력해주세요.")
+        return
+    if len(sentences) > MAX_BATCH_SENTENCES:
+        st.warning(f"앞의 {MAX_BATCH_SENTENCES}문장만 분석합니다.")
+        sentences = sentences[:MAX_BATCH_SENTENCES]
+    too_long = [i for i, s in enumerate(sentences) if len(s) > MAX_SENTENCE_CHARS]
+    todo = [s for i, s in enumerate(sentences) if i not in too_long]
+
+    st.markdown(LEGEND)
+    progress = st.progress(0, text=f"0 / {len(sentences)}")
+    # 결과가 도착하는 순서와 상관없이 문장 순서대로 보이도록 자리를 먼저 만든다
+    slots = [st.container() for _ in sentences]
+    for i in too_long:
+        with slots[i]:
+            st.markdown(f"**{i + 1}.** {sentences[i]}")
+            st.error("300자를 넘는 문장은 분석하지 않습니다.")
+
+    index_of = [i for i in range(len(sentences)) if i not in too_long]
+    done = len(too_long)
+    failed = 0
+    started = time.perf_counter()
+    for j, result, source, error in client.analyze_many(todo):
+        i = index_of[j]
+        with slots[i]:
+            st.markdown(f"**{i + 1}.** {sentences[i]}")
+            if error is not None:
+                failed += 1
+                st.error("분석 중 문제가 발생했습니다.")
+            else:
+                st.caption(CACHE_SOURCE_LABELS[source])
+                render_result(result, show_sentence=False)
+        done += 1
+        progress.progress(done / len(sentences), text=f"{done} / {len(sentences)}")
+
+    elapsed = time.perf_counter() - started
+    progress.empty()
+    st.success(
+        f"{len(todo)}문장 분석 {elapsed:.2f}초 ({len(todo) / max(elapsed, 1e-9):.1f}문장/초"
+        + (f", 실패 {failed}" if failed else "") + ")"
+    )
+
+with st.sidebar:
+    renderer = st.radio("시각화 방식", ["이미지", "인터랙티브 (Plotly)"])
+
+mode = st.radio("분석 방식", ["한 문장", "여러 문장 (일괄)"], horizontal=True)
+
+if mode == "한 문장":
+    user_input = st.text_area("네덜란드어 문장을 한 개만 입력하세요 (최대 300자).", max_chars=MAX_SENTENCE_CHARS)
+    if st.button("분석"):
+        analyze_single(user_input)
+else:
+    batch_input = st.text_area(
+        "네덜란드어 문단이나 기사 본문을 입력하세요. 문장 단위로 나눠 동시에 분석합니다.",
+        max_chars=MAX_BATCH_CHARS,
+        height=200,
+    )
+    if st.button("일괄 분석"):
+        analyze_batch(batch_input)
 
+show_cache_stats()
@@ -0,0 +1,118 @@
+# nlp_render.py
+# 의존 구문 호(arc) 시각화
+#
+# 모든 호의 좌표를 한 번에 numpy 배열로 계산하고 LineCollection 하나로 그린다.
+# pyplot 전역 상태를 쓰지 않고 Figure를 직접 만들어 PNG 바이트로 돌려주므로
+# 호출하는 쪽(st.cache_data)에서 결과를 그대로 캐시할 수 있다.
+import io
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+import matplotlib
+
+# 호 하나를 이루는 점 수 (화면 폭에서 500개와 구분되지 않음)
+ARC_POINTS = 120
+# 브라우저에서는 어차피 화면 폭으로 줄여 보이므로 래스터 폭을 이 값으로 제한 (긴 문장의 PNG 인코딩 시간 감소)
+MAX_IMAGE_WIDTH = 2000
+# 긴 문장은 위 제한 대신 단어당 이 폭(px)을 보장한다. 14pt 단어 라벨이 약 10px 높이로 남는 해상도
+MIN_WORD_WIDTH = 100
+ROOT_COLOR = (1.0, 0.0, 0.0)
+
+base_colors = matplotlib.colormaps["tab20"].colors  # 30가지 색 추출
+extra_colors = [
+    (0.9, 0.1, 0.1), (0.1, 0.9, 0.1), (0.1, 0.1, 0.9),
+    (0.9, 0.5, 0.1), (0.5, 0.1, 0.9), (0.1, 0.9, 0.5),
+    (0.6, 0.2, 0.2), (0.2, 0.6, 0.2), (0.2, 0.2, 0.6),
+    (0.8, 0.3, 0.4)
+]
+colors_30 = np.array(list(base_colors) + extra_colors)
+
+
+def arc_geometry(arcs, n_points=ARC_POINTS):
+    # (호 개수, n_points, 2) 좌표 배열과 각 호의 높이
+    arcs = np.asarray(arcs, dtype=float).reshape(-1, 2)
+    lo = arcs.min(axis=1)
+    hi = arcs.max(axis=1)
+    amplitude = np.maximum(hi - lo, 1)
+    t = np.linspace(0.0, 1.0, n_points)
+    x = lo[:, None] + (hi - lo)[:, None] * t
+    y = amplitude[:, None] * np.abs(np.sin(np.pi * t))
+    return np.stack([x, y], axis=-1), amplitude
+
+
+def arc_styles(arcs, relations, amplitude):
+    # ROOT에 의존한 단어는 빨간색, 나머지는 거리별 색. 왼쪽→오른쪽은 실선, 반대는 점선
+    heads = np.array([head for head, _ in arcs], dtype=int)
+    deps = np.array([dep for _, dep in arcs], dtype=int)
+    index = np.clip(amplitude.astype(int), 1, len(colors_30)) - 1
+    colors = colors_30[index, :3].copy()
+    is_root = np.array([relations[h] == "root" if 0 <= h < len(relations) else False for h in heads], dtype=bool)
+    colors[is_root] = ROOT_COLOR
+    dashed = heads < deps
+    return colors, dashed
+
+
+def build_figure(word_list, arcs, relations) -> Figure:
+    # 모든 호를 LineCollection 하나로 그린 Figure (pyplot 전역 상태 없음)
+    segments, amplitude = arc_geometry(arcs)
+    colors, dashed = arc_styles(arcs, relations, amplitude)
+
+    height = 6 if len(word_list) > 15 else 3                    # 15 단어 이상은 높이를 두배로 변경
+    fig = Figure(figsize=(len(word_list) * 2.0, height))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_xticks(range(len(word_list)))
+    ax.set_xticklabels(word_list, fontsize=14)
+    ax.set_yticks([])
+    ax.set_ylim(0, max(4, amplitude.max() + 1))
+    ax.set_xlim(-1, len(word_list))
+    ax.add_collection(LineCollection(
+        segments,
+        colors=colors,
+        linestyles=np.where(dashed, "--", "-").tolist(),
+        linewidths=2,
+    ))
+    ax.set_title("Dependency Structure", fontsize=16)
+    return fig
+
+
+def render_png(word_list, arcs, relations, dpi=100, max_width=MAX_IMAGE_WIDTH) -> bytes:
+    fig = build_figure(word_list, arcs, relations)
+    buf = io.BytesIO()
+    # 폭 제한은 단어 수에 맞춰 늘린다 (고정 폭이면 60단어에서 라벨이 약 3px로 뭉개짐)
+    max_width = max(max_width, len(word_list) * MIN_WORD_WIDTH)
+    dpi = min(dpi, max_width / fig.get_figwidth())
+    fig.savefig(buf, format="png", dpi=dpi, pil_kwargs={"compress_level": 1})
+    return buf.getvalue()
+
+
+def render_plotly(word_list, arcs, relations):
+    # 확대/이동이 되는 가벼운 버전. 색과 선 종류가 같은 호끼리 트레이스 하나로 묶는다
+    import plotly.graph_objects as go
+
+    segments, amplitude = arc_geometry(arcs, n_points=60)
+    colors, dashed = arc_styles(arcs, relations, amplitude)
+    groups = {}
+    for seg, color, dash in zip(segments, colors, dashed):
+        key = (tuple(np.round(color, 3)), bool(dash))
+        xs, ys = groups.setdefault(key, ([], []))
+        xs.extend(seg[:, 0].tolist() + [None])
+        ys.extend(seg[:, 1].tolist() + [None])
+
+    fig = go.Figure()
+    for (color, dash), (xs, ys) in groups.items():
+        fig.add_trace(go.Scatter(
+            x=xs, y=ys, mode="lines", hoverinfo="skip", showlegend=False,
+            line={"color": "rgb({:.0f},{:.0f},{:.0f})".format(*(c * 255 for c in color)),
+                  "dash": "dash" if dash else "solid", "width": 2},
+        ))
+    fig.update_layout(
+        title="Dependency Structure",
+        height=420 if len(word_list) > 15 else 300,
+        margin={"l": 10, "r": 10, "t": 40, "b": 10},
+        xaxis={"tickmode": "array", "tickvals": list(range(len(word_list))), "ticktext": word_list,
+               "range": [-1, len(word_list)]},
+        yaxis={"visible": False, "range": [0, max(4, float(amplitude.max()) + 1)]},
+    )
+    return fig
@@ -0,0 +1,146 @@
+# nos_crawler/daemon.py
+# 화면 없이 피드를 주기적으로 수집해 저장소와 내보내기 파일에 기록하는 데몬
+#
+# 실행 예:
+#   python -m nos_crawler.daemon --interval 300 --workers 4 --export-dir exports
+#   python -m nos_crawler.daemon --feeds feeds.json --once
+#
+# feeds.json 형식: {"이름": "URL"} 또는 {"이름": {"url": "URL", "interval": 초}}
+import argparse
+import heapq
+import json
+import logging
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from nos_crawler.export import RotatingExporter
+from nos_crawler.feeds import PRESET_FEEDS, fetch_feed, make_session
+from nos_crawler.store import ARTICLE_DB_PATH, ArticleStore
+
+log = logging.getLogger("nos_crawler.daemon")
+
+
+def load_feeds(path: str, default_interval: float) -> dict:
+    # {이름: (URL, 주기)}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    else:
+        raw = PRESET_FEEDS
+    feeds = {}
+    for name, value in raw.items():
+        if isinstance(value, str):
+            feeds[name] = (value, default_interval)
+        else:
+            feeds[name] = (value["url"], float(value.get("interval", default_interval)))
+    return feeds
+
+
+def next_run(now: float, interval: float, jitter: float) -> float:
+    # 여러 피드가 같은 순간에 몰리지 않도록 주기에 ±jitter 비율만큼 흔들림을 준다
+    return now + interval * (1 + random.uniform(-jitter, jitter))
+
+
+class CrawlerDaemon:
+    def __init__(self, feeds: dict, store: ArticleStore, count: int = 20, workers: int = 4,
+                 jitter: float = 0.1, exporter: RotatingExporter = None):
+        self.feeds = feeds
+        self.store = store
+        self.count = count
+        self.workers = workers
+        self.jitter = jitter
+        self.exporter = exporter
+        self.session = make_session(workers)
+        self.stop_event = threading.Event()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+
+    def poll(self, name: str):
+        url, _ = self.feeds[name]
+        started = time.perf_counter()
+        try:
+            items = fetch_feed(url, self.count, self.session, store=self.store)
+            log.info("%s: %d items in %.0f ms", name, len(items), (time.perf_counter() - started) * 1000)
+        except Exception:
+            log.exception("%s: poll failed", name)
+        finally:
+            with self._lock:
+                self._in_flight.discard(name)
+
+    def export(self):
+        if self.exporter is None:
+            return
+        try:
+            with self._export_lock:
+                exported = self.exporter.export_new(self.store)
+            if exported:
+                log.info("exported %d new articles", exported)
+        except Exception:
+            log.exception("export failed")
+
+    def run_once(self):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(self.poll, self.feeds))
+        self.export()
+
+    def run(self):
+        now = time.monotonic()
+        # 시작 시에도 한꺼번에 요청하지 않도록 첫 실행을 짧게 분산
+        queue = [(now + random.uniform(0, 1), name) for name in self.feeds]
+        heapq.heapify(queue)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while not self.stop_event.is_set():
+                due, name = queue[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self.stop_event.wait(min(wait, 1.0))
+                    continue
+                heapq.heappop(queue)
+                with self._lock:
+                    busy = name in self._in_flight
+                    if not busy:
+                        self._in_flight.add(name)
+                if not busy:
+                    pool.submit(self.poll, name).add_done_callback(lambda _: self.export())
+                heapq.heappush(queue, (next_run(time.monotonic(), self.feeds[name][1], self.jitter), name))
+        self.session.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NOS RSS crawler daemon")
+    parser.add_argument("--feeds", help="피드 설정 JSON (기본: NOS 프리셋)")
+    parser.add_argument("--interval", type=float, default=300, help="기본 수집 주기(초)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="주기 흔들림 비율 (0~1)")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 수집할 최대 피드 수")
+    parser.add_argument("--count", type=int, default=20, help="피드당 항목 수")
+    parser.add_argument("--db", default=ARTICLE_DB_PATH, help="기사 저장소 SQLite 경로")
+    parser.add_argument("--export-dir", help="내보내기 디렉터리 (없으면 내보내지 않음)")
+    parser.add_argument("--export-format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--once", action="store_true", help="모든 피드를 한 번만 수집하고 종료")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    exporter = RotatingExporter(args.export_dir, args.export_format) if args.export_dir else None
+    daemon = CrawlerDaemon(
+        load_feeds(args.feeds, args.interval),
+        ArticleStore(args.db),
+        count=args.count,
+        workers=args.workers,
+        jitter=args.jitter,
+        exporter=exporter,
+    )
+
+    if args.once:
+        daemon.run_once()
+        return
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: daemon.stop_event.set())
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
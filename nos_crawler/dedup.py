@@ -0,0 +1,71 @@
+# nos_crawler/dedup.py
+# 여러 피드에 제목만 조금 바뀌어 올라오는 같은 기사를 찾기 위한 MinHash + LSH
+#
+# 기사마다 단어 집합의 MinHash 서명(NUM_PERM개)을 만들고, 서명을 BANDS개 구간으로 나눠
+# 구간별 해시를 버킷 키로 쓴다. 버킷이 하나라도 같은 기사만 후보로 비교하므로
+# 기사 하나를 넣을 때 드는 비용은 보관된 기사 수와 거의 무관하다
+import re
+import zlib
+import numpy as np
+from nos_crawler.text import dutch_stopwords
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# 추정 Jaccard 유사도가 이 값 이상이면 같은 기사로 본다
+DUP_THRESHOLD = 0.7
+
+WORD_PATTERN = re.compile(r"[^\W\d_]{3,}")
+_PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(20240601)
+# 프로세스가 바뀌어도 같은 서명이 나오도록 고정 시드로 만든 해시 계수
+_A = _rng.integers(1, 1 << 32, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64)
+# 구간 안의 ROWS개 값을 버킷 키 하나로 섞는 홀수 계수 (2^64 나머지 연산으로 넘침 허용)
+_BAND_MULT = _rng.integers(1, 1 << 63, ROWS, dtype=np.uint64) | np.uint64(1)
+
+
+def shingles(text: str) -> set:
+    return {w for w in WORD_PATTERN.findall(text.lower()) if w not in dutch_stopwords}
+
+
+def signature(text: str):
+    # 단어가 하나도 없으면 None (중복 판정 대상에서 제외)
+    words = shingles(text)
+    if not words:
+        return None
+    x = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    # (a * x + b) mod p 를 순열 대신 사용. a, x, b < 2^32 이라 uint64 안에서 넘치지 않는다
+    return ((np.outer(x, _A) + _B) % _PRIME).min(axis=0)
+
+
+def band_keys(sig):
+    # 구간별 버킷 키 (SQLite INTEGER에 맞도록 부호 있는 64비트)
+    keys = (sig.reshape(BANDS, ROWS) * _BAND_MULT).sum(axis=1, dtype=np.uint64)
+    return keys.view(np.int64).tolist()
+
+
+def similarity(a, b) -> float:
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def to_blob(sig) -> bytes:
+    return sig.astype("<u8").tobytes()
+
+
+def from_blob(blob: bytes):
+    return np.frombuffer(blob, dtype="<u8")
+
+
+def group_duplicates(items):
+    # canonical이 같은 기사끼리 묶어 처음 나온 기사 하나만 남기고 나머지는 variants로 붙인다
+    groups = {}
+    out = []
+    for item in items:
+        key = item.get("canonical") or item["guid"]
+        if key in groups:
+            groups[key]["variants"].append(item)
+            continue
+        groups[key] = {**item, "variants": []}
+        out.append(groups[key])
+    return out
@@ -0,0 +1,134 @@
+# nos_crawler/export.py
+import csv
+import io
+import itertools
+import os
+import json
+import tempfile
+from datetime import datetime
+
+EXPORT_FIELDS = ["first_seen", "feed", "title", "url", "keywords"]
+# 한 번에 메모리에 올려 쓰는 행 수 (Parquet은 이 단위가 row group이 된다)
+EXPORT_CHUNK = 1000
+EXPORT_MIME = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def export_row(item: dict) -> dict:
+    return {
+        "first_seen": item.get("first_seen") or "",
+        "feed": item.get("feed") or "",
+        "title": item["title"],
+        "url": item["url"],
+        "keywords": ", ".join(item["keywords"]),
+    }
+
+
+def iter_chunks(rows, size: int = EXPORT_CHUNK):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_csv(rows, f, fields=EXPORT_FIELDS, header: bool = True, chunk_size: int = EXPORT_CHUNK) -> int:
+    # f: 바이너리 파일. rows는 이터레이터여도 되며 chunk_size씩만 메모리에 올린다
+    # 새 파일(header=True)에는 엑셀에서 한글이 깨지지 않도록 BOM을 붙인다
+    text = io.TextIOWrapper(f, encoding="utf-8-sig" if header else "utf-8", newline="")
+    writer = csv.DictWriter(text, fieldnames=fields, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    count = 0
+    for chunk in iter_chunks(rows, chunk_size):
+        writer.writerows(chunk)
+        count += len(chunk)
+    text.flush()
+    text.detach()
+    return count
+
+
+def write_parquet(rows, f, fields=EXPORT_FIELDS, chunk_size: int = EXPORT_CHUNK) -> int:
+    # 청크마다 row group 하나를 써서 전체를 한 번에 Arrow 테이블로 만들지 않는다
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, pa.string()) for name in fields])
+    count = 0
+    with pq.ParquetWriter(f, schema) as writer:
+        for chunk in iter_chunks(rows, chunk_size):
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            count += len(chunk)
+    return count
+
+
+def export_to_tempfile(rows, fmt: str = "csv", fields=EXPORT_FIELDS):
+    # 이름 없는 임시 파일에 스트리밍으로 쓰고 처음으로 되감아 반환한다 (닫히면 자동 삭제)
+    f = tempfile.TemporaryFile()
+    try:
+        if fmt == "csv":
+            write_csv(rows, f, fields)
+        elif fmt == "parquet":
+            write_parquet(rows, f, fields)
+        else:
+            raise ValueError(f"unsupported export format: {fmt}")
+    except Exception:
+        f.close()
+        raise
+    f.seek(0)
+    return f
+
+
+class RotatingExporter:
+    # 저장소에 새로 들어온 기사를 날짜별 파일로 내보낸다 (CSV는 이어쓰기, Parquet은 조각 파일)
+    # 마지막으로 내보낸 rowid는 상태 파일에 기록해 재시작 후에도 중복 없이 이어간다
+
+    def __init__(self, directory: str, fmt: str = "csv"):
+        if fmt not in ("csv", "parquet"):
+            raise ValueError(f"unsupported export format: {fmt}")
+        self.directory = directory
+        self.fmt = fmt
+        self.state_path = os.path.join(directory, ".export_state.json")
+        os.makedirs(directory, exist_ok=True)
+
+    def _last_rowid(self) -> int:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)["last_rowid"]
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def _save_rowid(self, rowid: int):
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"last_rowid": rowid}, f)
+        os.replace(tmp, self.state_path)
+
+    def export_new(self, store) -> int:
+        start = self._last_rowid()
+        items = store.iter_since(start)
+        first = next(items, None)
+        if first is None:
+            return 0
+        last_rowid = start
+
+        def rows():
+            nonlocal last_rowid
+            for rowid, item in itertools.chain([first], items):
+                last_rowid = rowid
+                yield export_row(item)
+
+        day = datetime.now().strftime("%Y%m%d")
+        if self.fmt == "csv":
+            path = os.path.join(self.directory, f"nos_articles_{day}.csv")
+            is_new = not os.path.exists(path)
+            with open(path, "ab") as f:
+                count = write_csv(rows(), f, header=is_new)
+        else:
+            # 마지막 rowid를 파일 이름에 넣기 위해 임시 이름으로 쓴 뒤 바꾼다
+            tmp = os.path.join(self.directory, f".nos_articles_{day}.parquet.tmp")
+            with open(tmp, "wb") as f:
+                count = write_parquet(rows(), f)
+            os.replace(tmp, os.path.join(self.directory, f"nos_articles_{day}_{last_rowid:09d}.parquet"))
+        self._save_rowid(last_rowid)
+        return count
@@ -0,0 +1,232 @@
+# nos_crawler/feeds.py
+import os
+import json
+import time
+import hashlib
+import itertools
+import threading
+import requests
+import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from nos_crawler.text import KeywordEngine, html_to_text
+from nos_crawler.dedup import group_duplicates
+
+# 저장소 루트 (캐시/DB 파일 위치 기준)
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRESET_FEEDS = {
+    "NOS Nieuws Algemeen": "https://feeds.nos.nl/nosnieuwsalgemeen",
+    "NOS Binnenland": "https://feeds.nos.nl/nosnieuwsbinnenland",
+    "NOS Buitenland": "https://feeds.nos.nl/nosnieuwsbuitenland",
+    "NOS Politiek": "https://feeds.nos.nl/nosnieuwspolitiek",
+    "NOS Economie": "https://feeds.nos.nl/nosnieuwseconomie",
+    "NOS Tech": "https://feeds.nos.nl/nosnieuwstech",
+    "NOS Opmerkelijk": "https://feeds.nos.nl/nosnieuwsopmerkelijk",
+    "NOS Sport Algemeen": "https://feeds.nos.nl/nossportalgemeen",
+}
+
+# --------------------- RSS Fetch (표준 XML로) ---------------------
+ATOM = "{http://www.w3.org/2005/Atom}"
+# 여러 피드를 동시에 가져올 때의 최대 동시 요청 수
+MAX_FEED_WORKERS = 8
+
+def make_session(pool_size: int = MAX_FEED_WORKERS) -> requests.Session:
+    # keep-alive 연결을 재사용하는 공유 세션
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def entry_from_element(item, atom: bool) -> dict:
+    if atom:
+        get = lambda tag: item.find(f"{ATOM}{tag}")
+        title = get("title").text if get("title") is not None else "(geen titel)"
+        link = None
+        for l in item.findall(f"{ATOM}link"):
+            if l.attrib.get("type") == "text/html" or l.attrib.get("rel") == "alternate":
+                link = l.attrib.get("href")
+                break
+        link = link or (get("link").attrib.get("href") if get("link") is not None else "")
+        summary_html = get("summary").text if get("summary") is not None else ""
+        guid = get("id").text if get("id") is not None else link
+    else:
+        get = lambda tag: item.find(tag)
+        title = get("title").text if get("title") is not None else "(geen titel)"
+        link = get("link").text if get("link") is not None else ""
+        summary_html = get("description").text if get("description") is not None else ""
+        guid = get("guid").text if get("guid") is not None else link
+    return {"guid": guid or link, "title": title, "url": link, "summary_html": summary_html or ""}
+
+def iter_feed_entries(chunks):
+    # RSS 2.0 <item>과 Atom <entry>를 한 번의 스트리밍 파싱으로 만나는 대로 내보낸다
+    # 처리한 항목은 부모에서 떼어내 트리가 커지지 않게 한다
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            if elem.tag == "item" or elem.tag == f"{ATOM}entry":
+                yield entry_from_element(elem, elem.tag != "item")
+                if stack:
+                    stack[-1].remove(elem)
+    parser.close()
+
+def parse_feed_entries(content: bytes, count: int):
+    # XML에서 원본 항목만 뽑는다 (HTML 정리/키워드 추출은 process_entries에서)
+    return list(itertools.islice(iter_feed_entries([content]), count))
+
+_default_engine = KeywordEngine()
+
+def process_entries(entries, progress_bar=None, engine=None, count_df=None):
+    # HTML 정리 후 묶음 단위로 TF-IDF 키워드 추출
+    engine = engine or _default_engine
+    summaries = []
+    for i, entry in enumerate(entries, start=1):
+        summaries.append(html_to_text(entry["summary_html"]))
+        if progress_bar:
+            progress_bar.progress(int(i / max(len(entries), 1) * 100))
+    if progress_bar:
+        progress_bar.empty()
+
+    texts = [f"{e['title']}\n{summary}" for e, summary in zip(entries, summaries)]
+    keywords = engine.keywords(texts, count_df=count_df) if texts else []
+    return [
+        {
+            "guid": e["guid"],
+            "title": e["title"],
+            "url": e["url"],
+            "summary": summary,
+            "keywords": [kw for kw, _ in kws],
+        }
+        for e, summary, kws in zip(entries, summaries, keywords)
+    ]
+
+def parse_feed_items(content: bytes, count: int, progress_bar=None, store=None, feed: str = ""):
+    entries = parse_feed_entries(content, count)
+    if store is None:
+        return process_entries(entries, progress_bar)
+    return store.sync(entries, feed, progress_bar)
+
+# --------------------- Feed cache (ETag / Last-Modified) ---------------------
+FEED_CACHE_DIR = os.path.join(DATA_DIR, ".feed_cache")
+
+def _cache_paths(feed_url: str):
+    key = hashlib.sha1(feed_url.encode("utf-8")).hexdigest()
+    return os.path.join(FEED_CACHE_DIR, f"{key}.json"), os.path.join(FEED_CACHE_DIR, f"{key}.xml")
+
+def _write_atomic(path: str, data: bytes):
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def load_feed_cache(feed_url: str):
+    meta_path, _ = _cache_paths(feed_url)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_feed_cache(feed_url: str, meta: dict, body: bytes = None):
+    os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+    meta_path, body_path = _cache_paths(feed_url)
+    if body is not None:
+        _write_atomic(body_path, body)
+    _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+FEED_CHUNK_SIZE = 16 * 1024
+
+def fetch_feed(feed_url: str, count: int = 5, session=None, progress_bar=None, store=None):
+    # 예외를 그대로 올려보내는 버전 (스레드에서 호출 가능, st.* 호출 없음)
+    # 캐시된 ETag/Last-Modified로 조건부 요청, 304면 저장된 항목을 그대로 사용
+    cached = load_feed_cache(feed_url)
+    if cached and cached["count"] < count and not cached.get("complete"):
+        # 본문을 끝까지 읽지 않은 캐시로는 더 많은 항목을 만들 수 없으므로 다시 받는다
+        cached = None
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    resp = (session or requests).get(feed_url, headers=headers, timeout=10, stream=True)
+    try:
+        if resp.status_code == 304 and cached:
+            if cached["count"] >= count:
+                return cached["items"][:count]
+            # 이전보다 많은 항목을 요청한 경우에만 저장된 본문을 다시 파싱
+            _, body_path = _cache_paths(feed_url)
+            with open(body_path, "rb") as f:
+                items = parse_feed_items(f.read(), count, progress_bar, store, feed_url)
+            save_feed_cache(feed_url, {**cached, "count": count, "items": items})
+            return items
+
+        resp.raise_for_status()
+        # count개를 얻는 즉시 읽기를 멈춘다 (큰 아카이브 피드도 앞부분만 받음)
+        body = []
+        state = {"complete": False}
+
+        def chunks():
+            for chunk in resp.iter_content(FEED_CHUNK_SIZE):
+                body.append(chunk)
+                yield chunk
+            state["complete"] = True
+
+        entries = list(itertools.islice(iter_feed_entries(chunks()), count))
+    finally:
+        resp.close()
+
+    if store is None:
+        items = process_entries(entries, progress_bar)
+    else:
+        items = store.sync(entries, feed_url, progress_bar)
+    save_feed_cache(feed_url, {
+        "url": feed_url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "count": count,
+        "complete": state["complete"],
+        "items": items,
+    }, b"".join(body) if state["complete"] else None)
+    return items
+
+def fetch_many_feeds(feeds: dict, count: int = 5, max_workers: int = MAX_FEED_WORKERS, store=None):
+    # feeds: {이름: URL}. 모든 피드를 동시에 가져와 URL/GUID 기준으로 중복 제거 후 합친다
+    # 저장소를 쓰면 제목만 다른 같은 기사도 대표 기사 하나로 묶는다 (variants)
+    session = make_session(max_workers)
+
+    def timed_fetch(name, url):
+        started = time.perf_counter()
+        try:
+            items = fetch_feed(url, count, session, store=store)
+            error = None
+        except Exception as e:
+            items, error = [], str(e)
+        return name, url, items, time.perf_counter() - started, error
+
+    merged, seen, stats = [], set(), []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(timed_fetch, name, url) for name, url in feeds.items()]
+        results = [f.result() for f in futures]
+    session.close()
+
+    # 결과는 feeds 순서대로 합쳐 같은 입력이면 같은 출력이 나오도록 한다
+    for name, url, items, latency, error in results:
+        new = 0
+        for item in items:
+            key = item["url"] or item["guid"]
+            if key in seen or item["guid"] in seen:
+                continue
+            seen.update({key, item["guid"]})
+            merged.append({**item, "feed": name})
+            new += 1
+        stats.append({"feed": name, "latency_ms": round(latency * 1000), "items": len(items), "new": new, "error": error})
+    return group_duplicates(merged), stats
@@ -0,0 +1,318 @@
+# nos_crawler/store.py
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from nos_crawler.text import KeywordEngine, html_to_text
+from nos_crawler.feeds import DATA_DIR, process_entries
+from nos_crawler import dedup
+
+# --------------------- Article store (SQLite) ---------------------
+ARTICLE_DB_PATH = os.path.join(DATA_DIR, "nos_articles.sqlite")
+
+ARTICLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    guid         TEXT PRIMARY KEY,
+    url          TEXT,
+    feed         TEXT,
+    title        TEXT,
+    summary      TEXT,
+    keywords     TEXT,
+    content_hash TEXT,
+    first_seen   TEXT,
+    last_seen    TEXT,
+    minhash      BLOB,
+    canonical    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
+CREATE INDEX IF NOT EXISTS idx_articles_first_seen ON articles(first_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_feed ON articles(feed, first_seen);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band   INTEGER,
+    bucket INTEGER,
+    guid   TEXT,
+    PRIMARY KEY (band, bucket, guid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_lsh_buckets_guid ON lsh_buckets(guid);
+CREATE TABLE IF NOT EXISTS term_df (
+    term TEXT PRIMARY KEY,
+    df   INTEGER
+);
+CREATE TABLE IF NOT EXISTS engine_meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER
+);
+"""
+# 예전 저장소 파일에 없던 컬럼 (열 때 추가)
+ARTICLE_MIGRATIONS = {"minhash": "BLOB", "canonical": "TEXT"}
+BACKFILL_BATCH = 1000
+
+def content_hash(entry: dict) -> str:
+    raw = "\0".join([entry["title"] or "", entry["url"] or "", entry["summary_html"] or ""])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+class ArticleStore:
+    # GUID로 색인된 기사 저장소. 처음 보거나 내용이 바뀐 항목만 process_entries를 거친다
+    # 다른 기사와 거의 같은 항목은 canonical에 대표 기사 GUID를 적고 키워드 추출을 건너뛴다
+
+    def __init__(self, path: str = ARTICLE_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        # 여러 피드를 동시에 sync할 때 같은 기사가 서로를 못 보고 둘 다 대표가 되지 않도록 직렬화
+        self._dedup_lock = threading.Lock()
+        conn = self._conn()
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(articles)")}
+        for name, sql_type in ARTICLE_MIGRATIONS.items():
+            if columns and name not in columns:
+                conn.execute(f"ALTER TABLE articles ADD COLUMN {name} {sql_type}")
+        conn.executescript(ARTICLE_SCHEMA)
+        conn.commit()
+        self._backfill_minhash(conn)
+        self.engine = self._load_engine(conn)
+
+    def _conn(self):
+        # sqlite 연결은 스레드마다 따로 사용
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _load_engine(self, conn):
+        # 이전 세션까지 누적된 문서 빈도로 키워드 엔진 복원
+        rows = conn.execute("SELECT term, df FROM term_df").fetchall()
+        meta = conn.execute("SELECT value FROM engine_meta WHERE key = 'n_docs'").fetchone()
+        vocab = {row["term"]: i for i, row in enumerate(rows)}
+        df = [row["df"] for row in rows]
+        return KeywordEngine(vocab, df, meta["value"] if meta else 0)
+
+    def _save_term_stats(self, conn):
+        # 이번 폴링에서 df가 바뀐 단어만 저장
+        stats, n_docs = self.engine.pop_dirty()
+        conn.executemany(
+            "INSERT INTO term_df (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = excluded.df",
+            stats,
+        )
+        conn.execute("INSERT OR REPLACE INTO engine_meta (key, value) VALUES ('n_docs', ?)", (n_docs,))
+
+    def _backfill_minhash(self, conn):
+        # 중복 판정 도입 전에 저장된 기사도 후보로 찾을 수 있게 서명만 채운다 (대표 지정은 하지 않음)
+        rowid = 0
+        while True:
+            rows = conn.execute(
+                """SELECT rowid, guid, title, summary FROM articles
+                   WHERE rowid > ? AND minhash IS NULL ORDER BY rowid LIMIT ?""",
+                (rowid, BACKFILL_BATCH),
+            ).fetchall()
+            if not rows:
+                return
+            rowid = rows[-1]["rowid"]
+            updates, buckets = [], []
+            for row in rows:
+                sig = dedup.signature(f"{row['title']}\n{row['summary']}")
+                updates.append((dedup.to_blob(sig) if sig is not None else b"", row["guid"]))
+                if sig is not None:
+                    buckets.extend((band, key, row["guid"]) for band, key in enumerate(dedup.band_keys(sig)))
+            with conn:
+                conn.executemany("UPDATE articles SET minhash = ? WHERE guid = ?", updates)
+                conn.executemany("INSERT OR IGNORE INTO lsh_buckets (band, bucket, guid) VALUES (?, ?, ?)", buckets)
+
+    @staticmethod
+    def _index_signature(conn, guid: str, sig):
+        conn.execute("DELETE FROM lsh_buckets WHERE guid = ?", (guid,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO lsh_buckets (band, bucket, guid) VALUES (?, ?, ?)",
+            [(band, key, guid) for band, key in enumerate(dedup.band_keys(sig))],
+        )
+
+    def _find_canonical(self, conn, guid: str, sig):
+        # 버킷이 겹치는 후보 중 가장 비슷한 기사의 대표 GUID와 그 키워드
+        keys = dedup.band_keys(sig)
+        # 구간마다 등호 조회를 UNION ALL로 이어야 (band, bucket) 기본 키를 탄다
+        # ((band, bucket) IN (VALUES ...) 는 lsh_buckets 전체를 훑는다)
+        lookups = " UNION ALL ".join("SELECT guid FROM lsh_buckets WHERE band = ? AND bucket = ?" for _ in keys)
+        rows = conn.execute(
+            f"""SELECT guid, minhash, canonical, keywords FROM articles
+                WHERE guid IN ({lookups})
+                  AND guid != ?""",
+            [v for pair in enumerate(keys) for v in pair] + [guid],
+        ).fetchall()
+        best, best_score = None, dedup.DUP_THRESHOLD
+        for row in rows:
+            if not row["minhash"]:
+                continue
+            score = dedup.similarity(sig, dedup.from_blob(row["minhash"]))
+            if score >= best_score:
+                best, best_score = row, score
+        if best is None:
+            return None, None
+        if best["canonical"]:
+            canonical = self._existing({best["canonical"]}).get(best["canonical"])
+            if canonical is not None:
+                return canonical["guid"], json.loads(canonical["keywords"] or "[]")
+        return best["guid"], json.loads(best["keywords"] or "[]")
+
+    @staticmethod
+    def _row_to_item(row) -> dict:
+        return {
+            "guid": row["guid"],
+            "title": row["title"],
+            "url": row["url"],
+            "summary": row["summary"],
+            "keywords": json.loads(row["keywords"] or "[]"),
+            "feed": row["feed"],
+            "first_seen": row["first_seen"],
+            "canonical": row["canonical"],
+        }
+
+    def _existing(self, guids):
+        if not guids:
+            return {}
+        conn = self._conn()
+        marks = ",".join("?" * len(guids))
+        rows = conn.execute(f"SELECT * FROM articles WHERE guid IN ({marks})", list(guids)).fetchall()
+        return {row["guid"]: row for row in rows}
+
+    def sync(self, entries, feed: str = "", progress_bar=None):
+        now = datetime.now().isoformat(timespec="seconds")
+        existing = self._existing({e["guid"] for e in entries})
+        hashes = [content_hash(e) for e in entries]
+        todo = [i for i, (e, h) in enumerate(zip(entries, hashes))
+                if e["guid"] not in existing or existing[e["guid"]]["content_hash"] != h]
+
+        summaries = {i: html_to_text(entries[i]["summary_html"]) for i in todo}
+        sigs = {i: dedup.signature(f"{entries[i]['title']}\n{summaries[i]}") for i in todo}
+
+        conn = self._conn()
+        with self._dedup_lock:
+            # 새 기사만 대표 기사를 찾는다. 이미 있던 기사는 처음 정한 대표를 유지
+            canonical = {}
+            batch = []   # 이번 묶음에서 대표가 된 (i, 서명)
+            for i in todo:
+                guid = entries[i]["guid"]
+                if guid in existing:
+                    if existing[guid]["canonical"]:
+                        canonical[i] = (existing[guid]["canonical"], json.loads(existing[guid]["keywords"] or "[]"))
+                    continue
+                if sigs[i] is None:
+                    continue
+                match = next((j for j, sig in batch if dedup.similarity(sigs[i], sig) >= dedup.DUP_THRESHOLD), None)
+                if match is not None:
+                    canonical[i] = (entries[match]["guid"], None)
+                    continue
+                found, keywords = self._find_canonical(conn, guid, sigs[i])
+                if found is not None:
+                    canonical[i] = (found, keywords)
+                else:
+                    batch.append((i, sigs[i]))
+
+            # 대표 기사만 키워드 추출과 문서 빈도 누적을 거친다
+            originals = [i for i in todo if i not in canonical]
+            results = process_entries([entries[i] for i in originals], progress_bar, self.engine,
+                                      count_df=[entries[i]["guid"] not in existing for i in originals])
+            processed = dict(zip(originals, results))
+            keywords_by_guid = {item["guid"]: item["keywords"] for item in results}
+            for i, (guid, keywords) in canonical.items():
+                e = entries[i]
+                processed[i] = {
+                    "guid": e["guid"],
+                    "title": e["title"],
+                    "url": e["url"],
+                    "summary": summaries[i],
+                    "keywords": keywords if keywords is not None else keywords_by_guid.get(guid, []),
+                    "canonical": guid,
+                }
+
+            with conn:
+                conn.executemany(
+                    """INSERT INTO articles (guid, url, feed, title, summary, keywords, content_hash, first_seen, last_seen,
+                                             minhash, canonical)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(guid) DO UPDATE SET url = excluded.url, title = excluded.title,
+                           summary = excluded.summary, keywords = excluded.keywords,
+                           content_hash = excluded.content_hash, last_seen = excluded.last_seen,
+                           minhash = excluded.minhash""",
+                    [(item["guid"], item["url"], feed, item["title"], item["summary"],
+                      json.dumps(item["keywords"], ensure_ascii=False), hashes[i], now, now,
+                      dedup.to_blob(sigs[i]) if sigs[i] is not None else b"", item.get("canonical"))
+                     for i, item in processed.items()],
+                )
+                for i in todo:
+                    if sigs[i] is not None:
+                        self._index_signature(conn, entries[i]["guid"], sigs[i])
+                conn.executemany(
+                    "UPDATE articles SET last_seen = ? WHERE guid = ?",
+                    [(now, entries[i]["guid"]) for i in range(len(entries)) if i not in processed],
+                )
+                if originals:
+                    self._save_term_stats(conn)
+
+        out = []
+        for i, entry in enumerate(entries):
+            if i in processed:
+                out.append({"canonical": None, **processed[i], "feed": feed,
+                            "first_seen": existing.get(entry["guid"], {"first_seen": now})["first_seen"]})
+            else:
+                out.append(self._row_to_item(existing[entry["guid"]]))
+        return out
+
+    @staticmethod
+    def _filters(search: str = "", feed: str = None, canonical_only: bool = False):
+        where, params = [], []
+        if canonical_only:
+            where.append("canonical IS NULL")
+        if search:
+            pattern = f"%{search}%"
+            where.append("(title LIKE ? OR keywords LIKE ?)")
+            params += [pattern, pattern]
+        if feed:
+            where.append("feed = ?")
+            params.append(feed)
+        return where, params
+
+    def recent(self, limit: int = 200, search: str = "", feed: str = None, canonical_only: bool = False):
+        conn = self._conn()
+        where, params = self._filters(search, feed, canonical_only)
+        sql = "SELECT * FROM articles"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = conn.execute(sql + " ORDER BY first_seen DESC, rowid DESC LIMIT ?", (*params, limit)).fetchall()
+        return [self._row_to_item(row) for row in rows]
+
+    def iter_articles(self, search: str = "", feed: str = None, batch: int = 500):
+        # 전체 기록을 최신순으로 batch개씩 읽어 내보낸다 (rowid 기준 keyset, 메모리 사용량 일정)
+        conn = self._conn()
+        where, params = self._filters(search, feed)
+        rowid = None
+        while True:
+            clauses = where + (["rowid < ?"] if rowid is not None else [])
+            sql = "SELECT rowid, * FROM articles"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            args = (*params, rowid) if rowid is not None else tuple(params)
+            rows = conn.execute(sql + " ORDER BY rowid DESC LIMIT ?", (*args, batch)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                rowid = row["rowid"]
+                yield self._row_to_item(row)
+
+    def iter_since(self, rowid: int = 0, batch: int = 500):
+        # rowid 이후에 새로 저장된 기사를 (rowid, 기사) 로 순서대로 내보낸다
+        conn = self._conn()
+        while True:
+            rows = conn.execute(
+                "SELECT rowid, * FROM articles WHERE rowid > ? ORDER BY rowid LIMIT ?", (rowid, batch)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                rowid = row["rowid"]
+                yield rowid, self._row_to_item(row)
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
@@ -0,0 +1,194 @@
+# nos_crawler/text.py
+import re
+import threading
+from html import unescape
+from html.parser import HTMLParser
+import numpy as np
+from bs4 import BeautifulSoup
+from scipy import sparse
+
+# --------------------- Stopwoorden ---------------------
+dutch_stopwords = {
+    "de", "en", "van", "ik", "te", "dat", "die", "in", "een", "hij", "het", "niet",
+    "zijn", "is", "was", "op", "aan", "met", "als", "voor", "had", "er", "maar",
+    "om", "hem", "dan", "zou", "of", "wat", "mijn", "men", "dit", "zo", "door",
+    "over", "ze", "zich", "bij", "ook", "tot", "je", "mij", "uit", "der", "daar",
+    "haar", "naar", "heb", "hoe", "heeft", "hebben", "deze", "u", "want", "nog",
+    "zal", "me", "zij", "nu", "ge", "geen", "omdat", "iets", "worden", "toch",
+    "al", "waren", "veel", "meer", "doen", "toen", "모et", "ben", "zonder", "kan",
+    "hun", "dus", "alles", "onder", "ja", "werd", "wezen", "zelf", "tegen",
+    "komen", "goed", "hier", "wie", "waarom"
+}
+
+# --------------------- Helper: safe preview ---------------------
+def make_safe_preview(md_text: str, max_sentences: int = 3, max_chars: int = 500) -> str:
+    if not md_text:
+        return ""
+    text = re.sub(r"\s+", " ", md_text).strip()
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    preview = " ".join(sentences[:max_sentences]).strip()
+    if len(preview) > max_chars:
+        cut = preview[:max_chars]
+        if " " in cut:
+            cut = cut.rsplit(" ", 1)[0]
+        preview = cut.rstrip(" .,;:") + "…"
+    return preview
+
+# --------------------- Trefwoordenextractie (TF-IDF) ---------------------
+# 유니코드 문자 5자 이상 (ë, é 등 네덜란드어 발음 구별 기호 포함)
+TOKEN_PATTERN = re.compile(r"[^\W\d_]{5,}")
+
+def tokenize(text: str):
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in dutch_stopwords]
+
+class KeywordEngine:
+    # 기사 묶음을 한 번에 희소 행렬로 만들고, 폴링 사이에 문서 빈도(df)를 누적한다
+    # 점수 = tf * (log((1 + N) / (1 + df)) + 1), 행 단위 L2 정규화
+
+    def __init__(self, vocab=None, df=None, n_docs: int = 0):
+        self.vocab = dict(vocab or {})
+        self.terms = sorted(self.vocab, key=self.vocab.get)
+        self.df = np.asarray(df if df is not None else np.zeros(len(self.vocab)), dtype=np.int64)
+        self.n_docs = n_docs
+        self.dirty = set()
+        self._lock = threading.Lock()
+
+    def _count_matrix(self, texts):
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                idx = self.vocab.get(token)
+                if idx is None:
+                    idx = self.vocab[token] = len(self.terms)
+                    self.terms.append(token)
+                rows.append(row)
+                cols.append(idx)
+        data = np.ones(len(rows), dtype=np.float64)
+        counts = sparse.csr_matrix((data, (rows, cols)), shape=(len(texts), len(self.terms)))
+        counts.sum_duplicates()
+        return counts
+
+    def _tfidf(self, counts):
+        idf = np.log((1 + self.n_docs) / (1 + self.df[:counts.shape[1]])) + 1
+        weighted = sparse.csr_matrix(counts.multiply(idf))
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.csr_matrix(sparse.diags(1 / norms) @ weighted)
+
+    def transform(self, texts, update: bool = True, count_df=None):
+        # count_df: 문서별로 df에 더할지 여부 (내용만 바뀐 기사는 다시 세지 않음)
+        with self._lock:
+            counts = self._count_matrix(texts)
+            if len(self.df) < len(self.terms):
+                self.df = np.concatenate([self.df, np.zeros(len(self.terms) - len(self.df), dtype=np.int64)])
+            if update:
+                mask = np.ones(len(texts), dtype=bool) if count_df is None else np.asarray(count_df, dtype=bool)
+                present = np.asarray((counts[mask] > 0).sum(axis=0)).ravel().astype(np.int64)
+                self.df[:counts.shape[1]] += present
+                self.dirty.update(np.flatnonzero(present).tolist())
+                self.n_docs += int(mask.sum())
+            return self._tfidf(counts)
+
+    def pop_dirty(self):
+        with self._lock:
+            stats = [(self.terms[i], int(self.df[i])) for i in self.dirty]
+            self.dirty = set()
+            return stats, self.n_docs
+
+    def top_terms(self, row_vector, top_n: int):
+        if row_vector.nnz == 0:
+            return []
+        order = np.argsort(-row_vector.data, kind="stable")[:top_n]
+        return [(self.terms[row_vector.indices[i]].capitalize(), float(row_vector.data[i])) for i in order]
+
+    def keywords(self, texts, top_n: int = 10, update: bool = True, count_df=None):
+        matrix = self.transform(texts, update, count_df)
+        return [self.top_terms(matrix.getrow(i), top_n) for i in range(matrix.shape[0])]
+
+    def trending(self, texts_by_group: dict, top_n: int = 10):
+        # 그룹(피드)별 기사 TF-IDF 합으로 많이 등장하는 특징적 단어를 뽑는다
+        out = {}
+        for group, texts in texts_by_group.items():
+            if not texts:
+                continue
+            matrix = self.transform(texts, update=False)
+            out[group] = self.top_terms(sparse.csr_matrix(matrix.sum(axis=0)), top_n)
+        return out
+
+# --------------------- HTML to text ---------------------
+class _TextExtractor(HTMLParser):
+    # 트리를 만들지 않고 텍스트 조각만 모으는 스트리밍 태그 제거기 (엔티티는 자동 변환)
+    SKIP_TAGS = {"script", "style", "template"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+
+    def reset(self):
+        super().reset()
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            data = data.strip()
+            if data:
+                self.parts.append(data)
+
+# 태그를 걷어낸 뒤에도 태그처럼 보이는 문자열이 남으면 깨진 HTML로 보고 BeautifulSoup로 처리
+_LEFTOVER_TAG = re.compile(r"<[a-zA-Z/!]")
+_extractors = threading.local()
+
+def html_to_text_bs4(html: str) -> str:
+    soup = BeautifulSoup(html or "", "html.parser")
+    return soup.get_text(separator=" ", strip=True)
+
+# 따옴표 속성값까지 고려한 태그 한 개 (주석/스크립트가 없는 단순 조각 전용)
+_SIMPLE_TAG = re.compile(r"""</?[a-zA-Z][^\s/>]*(?:\s+[^\s=/>]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+))?)*\s*/?>""")
+
+def _strip_simple_fragment(html: str):
+    # 대부분의 RSS 요약(p, a, strong, img 등)은 정규식 분할 + 엔티티 변환만으로 충분
+    parts = []
+    for piece in _SIMPLE_TAG.split(html):
+        if "&" in piece:
+            piece = unescape(piece)
+        piece = piece.strip()
+        if piece:
+            parts.append(piece)
+    return " ".join(parts)
+
+def _strip_with_parser(html: str) -> str:
+    # 파서 객체는 스레드마다 하나를 만들어 reset()으로 재사용
+    parser = getattr(_extractors, "parser", None)
+    if parser is None:
+        parser = _extractors.parser = _TextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+        return " ".join(parser.parts)
+    finally:
+        parser.reset()
+
+def html_to_text(html: str) -> str:
+    if not html:
+        return ""
+    if "<" not in html:
+        return unescape(html).strip() if "&" in html else html.strip()
+    lowered = html.lower()
+    try:
+        if "<!" in html or "<script" in lowered or "<style" in lowered or "<template" in lowered:
+            text = _strip_with_parser(html)
+        else:
+            text = _strip_simple_fragment(html)
+    except Exception:
+        return html_to_text_bs4(html)
+    if "<" in text and _LEFTOVER_TAG.search(text):
+        return html_to_text_bs4(html)
+    return text
@@ -1,12 +1,12 @@
 import streamlit as st
 from datetime import datetime
-from collections import Counter
-import csv
-import re
-import io
-import requests
-from bs4 import BeautifulSoup
+import itertools
+import time
 import xml.etree.ElementTree as ET
+from nos_crawler.feeds import PRESET_FEEDS, fetch_feed, fetch_many_feeds
+from nos_crawler.export import EXPORT_MIME, export_row, export_to_tempfile
+from nos_crawler.store import ArticleStore
+from nos_crawler.text import make_safe_preview
 
 st.set_page_config(page_title="NOS RSS crawler", layout="wide")
 st.title("NOS RSS crawler & trefwoorden")
@@ -20,144 +20,52 @@ st.info(
     icon="ℹ️",
 )
 
-# --------------------- Stopwoorden ---------------------
-dutch_stopwords = {
-    "de", "en", "van", "ik", "te", "dat", "die", "in", "een", "hij", "het", "niet",
-    "zijn", "is", "was", "op", "aan", "met", "als", "voor", "had", "er", "maar",
-    "om", "hem", "dan", "zou", "of", "wat", "mijn", "men", "dit", "zo", "door",
-    "over", "ze", "zich", "bij", "ook", "tot", "je", "mij", "uit", "der", "daar",
-    "haar", "naar", "heb", "hoe", "heeft", "hebben", "deze", "u", "want", "nog",
-    "zal", "me", "zij", "nu", "ge", "geen", "omdat", "iets", "worden", "toch",
-    "al", "waren", "veel", "meer", "doen", "toen", "모et", "ben", "zonder", "kan",
-    "hun", "dus", "alles", "onder", "ja", "werd", "wezen", "zelf", "tegen",
-    "komen", "goed", "hier", "wie", "waarom"
-}
-
-# --------------------- Helper: safe preview ---------------------
-def make_safe_preview(md_text: str, max_sentences: int = 3, max_chars: int = 500) -> str:
-    if not md_text:
-        return ""
-    text = re.sub(r"\s+", " ", md_text).strip()
-    sentences = re.split(r"(?<=[.!?])\s+", text)
-    preview = " ".join(sentences[:max_sentences]).strip()
-    if len(preview) > max_chars:
-        cut = preview[:max_chars]
-        if " " in cut:
-            cut = cut.rsplit(" ", 1)[0]
-        preview = cut.rstrip(" .,;:") + "…"
-    return preview
-
-# --------------------- Trefwoordenextractie ---------------------
-def extract_keywords(text: str, top_n: int = 10):
-    words = re.findall(r"\b[a-zA-Z]{8,}\b", text)
-    capitalized_words = [w.capitalize() for w in words]
-    filtered_words = [w for w in capitalized_words if w.lower() not in dutch_stopwords]
-    freq = Counter(filtered_words)
-
-    unique_keywords = []
-    for word, _ in freq.most_common():
-        if word not in unique_keywords:
-            unique_keywords.append(word)
-        if len(unique_keywords) >= top_n:
-            break
-
-    return [(kw, freq[kw]) for kw in unique_keywords], filtered_words
-
-# --------------------- HTML to text ---------------------
-def html_to_text(html: str) -> str:
-    soup = BeautifulSoup(html or "", "html.parser")
-    return soup.get_text(separator=" ", strip=True)
-
-# --------------------- RSS Fetch (표준 XML로) ---------------------
-def fetch_rss_items(feed_url: str, count: int = 5, progress_bar=None):
+# --------------------- RSS Fetch ---------------------
+def fetch_rss_items(feed_url: str, count: int = 5, progress_bar=None, store=None):
     try:
-        resp = requests.get(feed_url, timeout=10)
-        resp.raise_for_status()
+        return fetch_feed(feed_url, count, progress_bar=progress_bar, store=store)
+    except ET.ParseError as e:
+        st.error(f"RSS XML 파싱 실패: {e}")
     except Exception as e:
         st.error(f"RSS 피드 요청 실패: {e}")
-        return []
-
-    # RSS 피드 파싱 (ElementTree)
-    try:
-        tree = ET.fromstring(resp.content)
-    except Exception as e:
-        st.error(f"RSS XML 파싱 실패: {e}")
-        return []
-
-    # RSS 2.0: <item>들, Atom일 경우 <entry>들
-    items = tree.findall(".//item")
-    if not items:
-        # Atom 지원
-        items = tree.findall(".//{http://www.w3.org/2005/Atom}entry")
-        atom = True
-    else:
-        atom = False
-
-    total = min(count, len(items))
-    out = []
-
-    for i, item in enumerate(items[:total], start=1):
-        if atom:
-            get = lambda tag: item.find(f"{{http://www.w3.org/2005/Atom}}{tag}")
-            title = get("title").text if get("title") is not None else "(geen titel)"
-            link = None
-            for l in item.findall(f"{{http://www.w3.org/2005/Atom}}link"):
-                if l.attrib.get("type") == "text/html" or l.attrib.get("rel") == "alternate":
-                    link = l.attrib.get("href")
-                    break
-            link = link or (get("link").attrib.get("href") if get("link") is not None else "")
-            summary_html = get("summary").text if get("summary") is not None else ""
-        else:
-            get = lambda tag: item.find(tag)
-            title = get("title").text if get("title") is not None else "(geen titel)"
-            link = get("link").text if get("link") is not None else ""
-            summary_html = get("description").text if get("description") is not None else ""
-
-        summary_txt = html_to_text(summary_html)
-        keywords, _ = extract_keywords(f"{title}\n{summary_txt}")
-
-        out.append({
-            "title": title,
-            "url": link,
-            "summary": summary_txt,
-            "keywords": [kw for kw, _ in keywords],
-        })
-
-        if progress_bar:
-            progress_bar.progress(int(i / max(total, 1) * 100))
-
     if progress_bar:
         progress_bar.empty()
-
-    return out
+    return []
 
 # --------------------- CSV ---------------------
-def generate_csv_bytes(result):
-    if not result:
-        return None
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=["index", "title", "url", "keywords"])
-    writer.writeheader()
+RESULT_FIELDS = ["index", "title", "url", "keywords"]
+
+def result_rows(result):
     for idx, item in enumerate(result, 1):
-        writer.writerow({
+        yield {
             "index": idx,
             "title": item["title"],
             "url": item["url"],
             "keywords": ", ".join(item["keywords"]),
-        })
-    return output.getvalue().encode("utf-8-sig")
+        }
+
+# 다운로드 버튼으로 내보내는 최대 기사 수.
+# 누른 순간 Streamlit이 파일 전체를 bytes로 읽어 미디어 저장소(메모리)에 두므로 크기를 제한한다.
+# 전체 아카이브는 데몬의 --export-dir 로 디스크에 내보낸다
+DOWNLOAD_MAX_ROWS = 20000
+
+def export_result_csv(result):
+    # 다운로드를 누를 때만 만들고 세션 상태에는 복사본을 남기지 않는다
+    return lambda: export_to_tempfile(result_rows(result), "csv", fields=RESULT_FIELDS)
+
+def export_history(search, fmt):
+    # 최신 기사부터 DOWNLOAD_MAX_ROWS건까지
+    return lambda: export_to_tempfile(
+        map(export_row, itertools.islice(store.iter_articles(search), DOWNLOAD_MAX_ROWS)), fmt)
 
 # --------------------- UI ---------------------
-presets = {
-    "NOS Nieuws Algemeen": "https://feeds.nos.nl/nosnieuwsalgemeen",
-    "NOS Binnenland": "https://feeds.nos.nl/nosnieuwsbinnenland",
-    "NOS Buitenland": "https://feeds.nos.nl/nosnieuwsbuitenland",
-    "NOS Politiek": "https://feeds.nos.nl/nosnieuwspolitiek",
-    "NOS Economie": "https://feeds.nos.nl/nosnieuwseconomie",
-    "NOS Tech": "https://feeds.nos.nl/nosnieuwstech",
-    "NOS Opmerkelijk": "https://feeds.nos.nl/nosnieuwsopmerkelijk",
-    "NOS Sport Algemeen": "https://feeds.nos.nl/nossportalgemeen",
-}
+presets = PRESET_FEEDS
+
+@st.cache_resource
+def get_article_store():
+    return ArticleStore()
+
+store = get_article_store()
 
 left, right = st.columns([2, 3])
 with left:
@@ -169,20 +77,83 @@ with right:
 
 article_count = st.slider("항목 수", 1, 20, 5)
 
+all_presets = st.checkbox("모든 프리셋 피드 동시 수집", help="프리셋 피드를 동시에 가져와 중복 기사를 합칩니다.")
+
 # --------------------- Start Crawling ---------------------
 if st.button("RSS 가져오기"):
-    progress = st.progress(0)
-    result = fetch_rss_items(feed_url, article_count, progress)
+    if all_presets:
+        started = time.perf_counter()
+        with st.spinner("피드 수집 중..."):
+            result, feed_stats = fetch_many_feeds(presets, article_count, store=store)
+        st.session_state["feed_stats"] = feed_stats
+        st.session_state["feed_sweep_ms"] = round((time.perf_counter() - started) * 1000)
+    else:
+        st.session_state.pop("feed_stats", None)
+        progress = st.progress(0)
+        result = fetch_rss_items(feed_url, article_count, progress, store=store)
     if result:
         st.session_state["rss_result"] = result
         st.success(f"✅ {len(result)}개의 뉴스 항목을 가져왔습니다.")
 
+if "feed_stats" in st.session_state:
+    with st.expander(f"피드별 수집 결과 (전체 {st.session_state['feed_sweep_ms']} ms)"):
+        st.dataframe(st.session_state["feed_stats"], hide_index=True, use_container_width=True)
+
+with st.expander(f"수집 기록 (저장된 기사 {store.count()}건)"):
+    history_search = st.text_input("제목/키워드 검색", key="history_search")
+    history = store.recent(200, history_search.strip(), canonical_only=True)
+    if history:
+        st.dataframe(
+            [{"수집 시각": h["first_seen"], "제목": h["title"], "키워드": ", ".join(h["keywords"]), "URL": h["url"]}
+             for h in history],
+            hide_index=True,
+            use_container_width=True,
+        )
+    else:
+        st.write("저장된 기사가 없습니다.")
+
+    export_fmt = st.radio("내보내기 형식", ["csv", "parquet"], horizontal=True, key="history_export_fmt")
+    capped = store.count() > DOWNLOAD_MAX_ROWS
+    if capped:
+        st.caption(f"다운로드는 최신 {DOWNLOAD_MAX_ROWS:,}건까지입니다. 전체 기록은 "
+                   "`python -m nos_crawler.daemon --export-dir exports` 로 파일에 내보내세요.")
+    st.download_button(
+        label=("📦 최근 기록 내보내기" if capped else "📦 전체 기록 내보내기")
+              + (" (검색 결과)" if history_search.strip() else ""),
+        data=export_history(history_search.strip(), export_fmt),
+        file_name=f"nos_articles_{datetime.now().strftime('%Y%m%d_%H%M')}.{export_fmt}",
+        mime=EXPORT_MIME[export_fmt],
+        on_click="ignore",
+    )
+
 # --------------------- Show Results ---------------------
+# 이번 세션에서 직접 수집하지 않았다면 데몬(python -m nos_crawler.daemon)이 저장해 둔 결과를 바로 표시
 if "rss_result" in st.session_state:
     result = st.session_state["rss_result"]
+else:
+    result = store.recent(article_count * (len(presets) if all_presets else 1),
+                          feed=None if all_presets else feed_url, canonical_only=all_presets)
+    if result:
+        st.caption("저장소에 미리 수집된 최근 기사입니다. 새로 가져오려면 'RSS 가져오기'를 누르세요.")
+
+feed_names = {url: name for name, url in presets.items()}
+
+if result:
+
+    with st.expander("피드별 트렌드 키워드"):
+        by_feed = {}
+        for item in result:
+            by_feed.setdefault(feed_names.get(item.get("feed"), item.get("feed") or feed_url), []).append(f"{item['title']}\n{item['summary']}")
+        for feed_name, terms in store.engine.trending(by_feed, 10).items():
+            st.markdown(f"**{feed_name}:** {', '.join(term for term, _ in terms)}")
 
     for i, item in enumerate(result, 1):
         st.markdown(f"### {i}. {item['title']}")
+        if item.get("feed"):
+            st.caption(feed_names.get(item["feed"], item["feed"]))
+        if item.get("variants"):
+            st.caption("같은 기사: " + " · ".join(
+                f"[{feed_names.get(v['feed'], v['feed'])}]({v['url']})" for v in item["variants"]))
         st.markdown(f"🔗 [원문 링크]({item['url']})")
         st.markdown(f"**Trefwoorden:** {', '.join(item['keywords'])}")
         with st.expander("요약 보기 (최대 3문장·500자)"):
@@ -191,18 +162,10 @@ if "rss_result" in st.session_state:
             if item["url"]:
                 st.markdown(f"_Bron: [NOS.nl]({item['url']})_")
 
-    if st.button("📥 CSV 저장하기"):
-        csv_bytes = generate_csv_bytes(result)
-        if csv_bytes:
-            st.session_state["csv_data"] = csv_bytes
-            st.success("✅ CSV 파일이 생성되었습니다.")
-        else:
-            st.warning("⚠️ 저장할 데이터가 없습니다.")
-
-    if "csv_data" in st.session_state:
-        st.download_button(
-            label="📄 CSV 다운로드",
-            data=st.session_state["csv_data"],
-            file_name=f"nos_rss_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-            mime="text/csv",
-        )
+    st.download_button(
+        label="📄 CSV 다운로드",
+        data=export_result_csv(result),
+        file_name=f"nos_rss_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+        mime="text/csv",
+        on_click="ignore",
+    )
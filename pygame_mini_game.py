@@ -2,52 +2,108 @@ import pygame
 import sys
 import random
 import os
-
-# 초기화
-pygame.init()
-pygame.mixer.init()  # 오디오 초기화
+import time
+from collections import OrderedDict, deque
 
 WIDTH, HEIGHT = 1280, 720
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Rhythm RPG")
-clock = pygame.time.Clock()
 FPS = 60
+# 입력 판정과 남은 시간은 렌더링 프레임과 별개로 이 간격(ms)의 고정 스텝으로 진행한다
+SIM_STEP_MS = 5
+# 창을 끌거나 멈췄다 돌아와 프레임이 크게 밀렸을 때 한 프레임에 따라잡는 최대 시간(ms)
+MAX_CATCHUP_MS = 250
+# 라운드 결과(정답 수)를 보여주는 시간(ms)
+RESULT_SHOW_MS = 1200
 
-# 색상/폰트
+# 색상
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (200, 0, 0)
 GREEN = (0, 200, 0)
 GRAY = (150, 150, 150)
-FONT = pygame.font.SysFont("malgungothic", 48)
-SMALL_FONT = pygame.font.SysFont("malgungothic", 32)
-BIG_FONT = pygame.font.SysFont("Arial", 72)
 
-# 이미지 로드 함수 (상대경로)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# init_game()에서 채워지는 화면/폰트/이미지
+screen = None
+clock = None
+FONT = SMALL_FONT = BIG_FONT = DEBUG_FONT = None
+background = hero = monster = None
+hero_pos = monster_pos = None
+ARROW_GLYPHS = {}
+# 헤드리스 실행이면 SDL dummy 드라이버를 쓰고, 없는 이미지/소리는 대체 리소스로 채운다
+HEADLESS = False
+
+# 헤드리스 실행에서 이미지 파일이 없을 때 쓰는 원본 크기 (아래 축소 비율을 거친 뒤 화면에 맞는 크기)
+PLACEHOLDER_SIZES = {
+    "any_background_image.png": ((WIDTH, HEIGHT), (40, 90, 140)),
+    "any_hero_image.png": ((1200, 1600), (60, 160, 220)),
+    "any_monster_image.png": ((900, 1000), (170, 60, 70)),
+}
+
+# 이미지 로드 함수 (상대경로)
 def load_image(filename):
-    return pygame.image.load(os.path.join(BASE_DIR, filename)).convert_alpha()
+    path = os.path.join(BASE_DIR, filename)
+    if HEADLESS and not os.path.exists(path):
+        size, color = PLACEHOLDER_SIZES.get(filename, ((100, 100), GRAY))
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf.fill(color)
+        return surf
+    return pygame.image.load(path).convert_alpha()
+
+# 효과음 로드 (헤드리스에서 파일이 없으면 무음)
+def load_sound(filename):
+    path = os.path.join(BASE_DIR, filename)
+    if HEADLESS and not os.path.exists(path):
+        return pygame.mixer.Sound(buffer=bytes(64))
+    return pygame.mixer.Sound(path)
+
+# 초기화 (import만 해서는 창을 띄우지 않도록 실행 시점에 호출)
+def init_game(headless=False):
+    global screen, clock, FONT, SMALL_FONT, BIG_FONT, DEBUG_FONT, HEADLESS
+    global background, hero, monster, hero_pos, monster_pos, ARROW_GLYPHS
+    if screen is not None:
+        return
+    HEADLESS = headless
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+    pygame.mixer.init()  # 오디오 초기화
+
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Rhythm RPG")
+    clock = pygame.time.Clock()
+
+    # 폰트
+    FONT = pygame.font.SysFont("malgungothic", 48)
+    SMALL_FONT = pygame.font.SysFont("malgungothic", 32)
+    BIG_FONT = pygame.font.SysFont("Arial", 72)
+    DEBUG_FONT = pygame.font.SysFont("Arial", 18)
+
+    # 배경음악 추가
+    music_path = os.path.join(BASE_DIR, "any_background_music.wav")
+    if not (headless and not os.path.exists(music_path)):
+        pygame.mixer.music.load(music_path)
+        pygame.mixer.music.play(-1)  # 무한 반복 재생
 
-# 배경음악 추가
-music_path = os.path.join(BASE_DIR, "any_background_music.wav")
-pygame.mixer.music.load(music_path)
-pygame.mixer.music.play(-1)  # 무한 반복 재생
+    # 이미지 로드
+    background = load_image("any_background_image.png")
+    background = pygame.transform.scale(background, (WIDTH, HEIGHT))
 
-# 이미지 로드
-background = load_image("any_background_image.png")
-background = pygame.transform.scale(background, (WIDTH, HEIGHT))
+    # 영웅 이미지
+    hero_img_raw = load_image("any_hero_image.png")
+    hero = pygame.transform.scale(hero_img_raw, (int(hero_img_raw.get_width() * 0.15), int(hero_img_raw.get_height() * 0.15)))
 
-# 영웅 이미지
-hero_img_raw = load_image("any_hero_image.png")
-hero = pygame.transform.scale(hero_img_raw, (int(hero_img_raw.get_width() * 0.15), int(hero_img_raw.get_height() * 0.15)))
+    # 몬스터 이미지
+    monster_img_raw = load_image("any_monster_image.png")
+    monster = pygame.transform.scale(monster_img_raw, (int(monster_img_raw.get_width() * 0.4), int(monster_img_raw.get_height() * 0.4)))
 
-# 몬스터 이미지
-monster_img_raw = load_image("any_monster_image.png")
-monster = pygame.transform.scale(monster_img_raw, (int(monster_img_raw.get_width() * 0.4), int(monster_img_raw.get_height() * 0.4)))
+    # 위치 계산
+    hero_pos = (50, HEIGHT - hero.get_height() - 50)
+    monster_pos = (WIDTH - monster.get_width() - 50, HEIGHT - monster.get_height() - 0)
 
-# 위치 계산
-hero_pos = (50, HEIGHT - hero.get_height() - 50)
-monster_pos = (WIDTH - monster.get_width() - 50, HEIGHT - monster.get_height() - 0)
+    # 방향키 상자에 들어가는 화살표는 네 가지뿐이라 미리 그려 둔다
+    ARROW_GLYPHS = {key: SMALL_FONT.render(arrow, True, WHITE) for key, arrow in KEY_MAP.items()}
 
 # 방향키 문자열 매핑
 KEY_MAP = {
@@ -58,30 +114,122 @@ KEY_MAP = {
 }
 
 # 체력 바 그리기(보스)
-def draw_boss_hp_bar(hp, max_hp):
+def draw_boss_hp_bar(hp, max_hp, surface=None):
+    surface = surface or screen
     bar_x = 600
     bar_y = 30
     for i in range(max_hp):
         color = GREEN if i < hp else GRAY
-        pygame.draw.rect(screen, color, (bar_x + i * 40, bar_y, 30, 30))
+        pygame.draw.rect(surface, color, (bar_x + i * 40, bar_y, 30, 30))
+    return pygame.Rect(bar_x, bar_y, max_hp * 40, 30)
 
 # 체력 바 그리기(용사)
-def draw_hero_hp_bar(hp, max_hp):
+def draw_hero_hp_bar(hp, max_hp, surface=None):
+    surface = surface or screen
     # hero_pos 기준으로 체력 바 위치 계산
     bar_x = hero_pos[0] + 20
     bar_y = hero_pos[1] - 40  # 머리 위 40픽셀 위에 표시
     for i in range(max_hp):
         color = RED if i < hp else GRAY
-        pygame.draw.rect(screen, color, (bar_x + i * 40, bar_y, 30, 30))
+        pygame.draw.rect(surface, color, (bar_x + i * 40, bar_y, 30, 30))
+    return pygame.Rect(bar_x, bar_y, max_hp * 40, 30)
 
-# 텍스트 렌더링
+# 렌더링한 글자 서피스 캐시 (font.render가 프레임 루프에서 가장 비싼 호출이라 같은 문자열은 재사용)
+class TextCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()   # (문자열, 폰트, 색) -> Surface
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, color):
+        key = (text, font, tuple(color))
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self.surfaces[key] = surf
+        while len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def stats_text(self):
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return f"text cache {len(self.surfaces)}/{self.maxsize}  hit {self.hits}  miss {self.misses}  ({rate:.0%})"
+
+text_cache = TextCache()
+
+# 텍스트 렌더링 (그린 영역 반환)
 def draw_text(text, font, color, surface, x, y):
-    render = font.render(text, True, color)
+    render = text_cache.render(text, font, color)
     rect = render.get_rect(center=(x, y))
     surface.blit(render, rect)
+    return rect
+
+# 배경 + 용사 + 몬스터는 바뀌지 않으므로 한 번만 합성해 둔다
+_scene = None
+def get_scene():
+    global _scene
+    if _scene is None:
+        _scene = background.copy().convert()
+        _scene.blit(hero, hero_pos)
+        _scene.blit(monster, monster_pos)
+    return _scene
+
+class DirtyLayer:
+    # base 위에서 바뀐 부분만 다시 그리고 그 영역만 화면에 반영한다
+    def __init__(self, base):
+        self.base = base
+        self.regions = {}   # 이름 -> 마지막으로 그린 영역
+        self.dirty = []
+        screen.blit(base, (0, 0))
+        self.dirty.append(screen.get_rect())
+
+    def redraw(self, name, draw):
+        # 이전에 그린 영역을 base로 되돌린 뒤 draw()가 돌려준 새 영역을 기록
+        old = self.regions.get(name)
+        if old is not None:
+            screen.blit(self.base, old, old)
+        new = draw()
+        self.regions[name] = new
+        self.dirty.append(new.union(old) if old is not None else new)
+
+    def clear(self, name):
+        # 그렸던 영역을 base로 되돌리고 더 이상 추적하지 않음
+        old = self.regions.pop(name, None)
+        if old is not None:
+            screen.blit(self.base, old, old)
+            self.dirty.append(old)
+
+    def flush(self):
+        if self.dirty:
+            pygame.display.update(self.dirty)
+            self.dirty = []
+
+# F3으로 켜고 끄는 디버그 표시 (글자 캐시 적중/미스, FPS)
+show_debug = False
+
+def draw_debug_overlay():
+    # 캐시 통계가 흔들리지 않도록 이 글자는 캐시를 거치지 않고 그린다
+    render = DEBUG_FONT.render(f"{text_cache.stats_text()}  fps {clock.get_fps():.0f}", True, WHITE, BLACK)
+    return screen.blit(render, (10, 10))
 
-# 방향키 시퀀스 그리기
-def draw_directions(direction_list, user_input, start_y):
+def toggle_debug_overlay(layer):
+    global show_debug
+    show_debug = not show_debug
+    if show_debug:
+        layer.redraw("debug", draw_debug_overlay)
+    else:
+        layer.clear("debug")
+
+# 방향키 시퀀스 그리기 (그린 영역 반환)
+def draw_directions(direction_list, user_input, start_y, surface=None):
+    surface = surface or screen
+    bounds = pygame.Rect(WIDTH // 2, start_y, 0, 0)
     box_size = 50
     margin = 8
     max_per_row = 10
@@ -103,12 +251,13 @@ def draw_directions(direction_list, user_input, start_y):
                     color = (200, 0, 0)
             else:
                 color = (100, 100, 100)
-        pygame.draw.rect(screen, color, rect, border_radius=6)
-        if key in KEY_MAP:
-            key_text = KEY_MAP[key]
-            text_surf = SMALL_FONT.render(key_text, True, (255, 255, 255))
+        pygame.draw.rect(surface, color, rect, border_radius=6)
+        bounds.union_ip(rect)
+        if key in ARROW_GLYPHS:
+            text_surf = ARROW_GLYPHS[key]
             text_rect = text_surf.get_rect(center=rect.center)
-            screen.blit(text_surf, text_rect)
+            surface.blit(text_surf, text_rect)
+    return bounds
 
 # 라운드별 난이도/시간 설정
 def get_round_settings(round_num):
@@ -126,74 +275,203 @@ def get_round_settings(round_num):
 def generate_random_directions(length, allowed_keys):
     return [random.choice(allowed_keys) for _ in range(length)]
 
+# 헤드리스 실행용 자동 입력. 프레임이 아니라 게임 시간 기준으로 키를 넣고 눌린 시각(pressed_ms)을
+# 이벤트에 붙여, FPS와 상관없이 같은 seed면 같은 결과가 나온다
+class ScriptedPlayer:
+    def __init__(self, seed=0, ms_per_key=40, accuracy=0.95, games=1):
+        self.rng = random.Random(seed)
+        self.ms_per_key = ms_per_key
+        self.accuracy = accuracy
+        self.games = games          # 이 판 수만큼 끝나면 종료(N)를 누른다
+        self.games_played = 0
+        self.pending = deque()      # (화면이 바뀐 뒤 입력할 시각 ms, 키)
+        self.started = 0            # 게임 시간을 주지 않는 화면에서 쓰는 기준 시각
+
+    def expect(self, screen_name, target=None, allowed_keys=None):
+        # 화면이 바뀔 때 게임 쪽에서 불러 다음에 누를 키를 예약
+        if screen_name == "start":
+            self._schedule([pygame.K_y])
+        elif screen_name == "round":
+            keys = []
+            for key in target:
+                if self.rng.random() >= self.accuracy:
+                    key = self.rng.choice([k for k in allowed_keys if k != key] or allowed_keys)
+                keys.append(key)
+            self._schedule(keys)
+        elif screen_name == "end":
+            self.games_played += 1
+            self._schedule([pygame.K_n if self.games_played >= self.games else pygame.K_y])
+
+    def _schedule(self, keys):
+        self.pending.clear()
+        self.started = pygame.time.get_ticks()
+        for i, key in enumerate(keys, 1):
+            self.pending.append((i * self.ms_per_key, key))
+
+    def post_events(self, game_ms=None):
+        # game_ms: 미니게임 라운드의 게임 시간. 없으면 화면이 바뀐 뒤 흐른 실제 시간
+        if game_ms is None:
+            game_ms = pygame.time.get_ticks() - self.started
+        while self.pending and self.pending[0][0] <= game_ms:
+            pressed_ms, key = self.pending.popleft()
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, pressed_ms=pressed_ms))
+
+# 프레임마다 갱신(입력/판정)과 그리기에 걸린 시간 기록
+class FrameStats:
+    def __init__(self):
+        self.update_ms = []
+        self.render_ms = []
+        self.results = []   # 라운드별 (정답 수, 전체)
+
+    def record(self, update_s, render_s):
+        self.update_ms.append(update_s * 1000)
+        self.render_ms.append(render_s * 1000)
+
+    def report(self):
+        frame_ms = [u + r for u, r in zip(self.update_ms, self.render_ms)]
+        out = {"frames": len(frame_ms), "rounds": len(self.results), "results": self.results}
+        for name, values in (("update", self.update_ms), ("render", self.render_ms), ("frame", frame_ms)):
+            ordered = sorted(values)
+            out[name] = {f"p{p}": percentile(ordered, p) for p in (50, 95, 99)}
+            out[name]["max"] = ordered[-1] if ordered else 0.0
+        return out
+
+def percentile(ordered, p):
+    # 정렬된 목록의 nearest-rank 백분위수
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+# 헤드리스 실행 때만 설정된다
+input_player = None
+frame_stats = None
+
+def expect_input(screen_name, **info):
+    if input_player is not None:
+        input_player.expect(screen_name, **info)
+
+def poll_events(game_ms=None):
+    if input_player is not None:
+        input_player.post_events(game_ms)
+    return pygame.event.get()
+
 # 게임 시작 대기 화면
 def wait_for_start():
     screen.blit(background, (0, 0))
     draw_text("게임을 시작하려면 Y를 누르세요", SMALL_FONT, (255, 255, 255), screen, WIDTH // 2, HEIGHT // 2)
     pygame.display.flip()
+    expect_input("start")
     while True:
-        for event in pygame.event.get():
+        for event in poll_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_y:
                     return
+        clock.tick(FPS)
+
+# pygame.time.wait 대신 쓰는 화면 유지. 기다리는 동안에도 이벤트를 처리해 창이 멈추지 않는다
+def hold_screen(duration_ms):
+    until = pygame.time.get_ticks() + duration_ms
+    while pygame.time.get_ticks() < until:
+        for event in poll_events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+        clock.tick(FPS)
 
 # 미니게임(방향키 입력) 세션
 def direction_mini_game(round_num):
     input_length, time_limit, allowed_keys = get_round_settings(round_num)
     target = generate_random_directions(input_length, allowed_keys)
+    expect_input("round", target=target, allowed_keys=allowed_keys)
     user_input = []
-    start_time = pygame.time.get_ticks()
-    input_completed = False
-    result_show_start = None
     correct_count = 0
-    timer_stopped = False
+    time_limit_ms = time_limit * 1000
+    round_ms = 0          # 라운드 시작 후 흐른 게임 시간 (SIM_STEP_MS 단위로 진행)
+    lag_ms = 0            # 아직 스텝으로 처리하지 않은 시간
+    last_tick = pygame.time.get_ticks()
+    pending = deque()     # (입력 시각, 키) - 해당 시각의 스텝에서 판정
+    result_at = None      # 입력 완료/시간 초과가 일어난 게임 시각
+
+    # 라운드 동안 바뀌지 않는 제목/안내 문구/체력 바는 배경 레이어에 한 번만 그린다
+    base = get_scene().copy()
+    draw_text(f"방향키 입력 미니게임 (라운드 {round_num})", SMALL_FONT, (200, 200, 200), base, WIDTH // 2, 100)
+    draw_hero_hp_bar(hero_hp, max_hero_hp, base)
+    draw_boss_hp_bar(enemy_hp, max_hp, base)
+    draw_text("입력할 방향:", SMALL_FONT, (255, 255, 255), base, WIDTH // 2, HEIGHT // 4)
+    draw_text("입력한 방향:", SMALL_FONT, (200, 200, 200), base, WIDTH // 2, HEIGHT // 2 + 80)
+    layer = DirtyLayer(base)
+    shown_tenths = None
+    drawn_inputs = -1
+    result_drawn = False
     while True:
-        screen.blit(background, (0, 0))
-        screen.blit(hero, hero_pos)
-        screen.blit(monster, monster_pos)
-        draw_text(f"방향키 입력 미니게임 (라운드 {round_num})", SMALL_FONT, (200, 200, 200), screen, WIDTH // 2, 100)
-        draw_hero_hp_bar(hero_hp, max_hero_hp)
-        draw_boss_hp_bar(enemy_hp, max_hp)
-        current_time = pygame.time.get_ticks()
-        if not timer_stopped:
-            elapsed_time = (current_time - start_time) / 1000
-            remaining_time = max(0, time_limit - elapsed_time)
-        elif result_show_start is not None:
-            remaining_time = max(0, time_limit - (result_show_start - start_time) / 1000)
-        else:
-            remaining_time = 0
-        draw_text(f"남은 시간: {remaining_time:.1f} / {time_limit:.1f} 초", SMALL_FONT, (255, 100, 100), screen, WIDTH // 2, HEIGHT // 4 - 40)
-        draw_text("입력할 방향:", SMALL_FONT, (255, 255, 255), screen, WIDTH // 2, HEIGHT // 4)
-        draw_directions(target, user_input, HEIGHT // 4 + 40)
-        draw_text("입력한 방향:", SMALL_FONT, (200, 200, 200), screen, WIDTH // 2, HEIGHT // 2 + 80)
-        draw_directions(user_input, user_input, HEIGHT // 2 + 110)
-        for event in pygame.event.get():
+        frame_start = time.perf_counter()
+        # ===== 갱신: 입력에 시각을 붙여 두고 고정 스텝으로 판정 =====
+        # pygame 2 키 이벤트에는 눌린 시각이 없으므로, 눌렸을 수 있는 가장 이른 시각인
+        # 직전 프레임의 게임 시각을 붙인다. 그래야 마감 직전에 눌렸는데 늦은 프레임에 들어온 키도
+        # 시간 초과보다 먼저 판정된다. 같은 프레임에 들어온 키는 모두 같은 시각이 되므로
+        # 판정 해상도는 SIM_STEP_MS가 아니라 프레임 간격이다 (고정 스텝은 판정 순서만 보장)
+        event_time = round_ms + lag_ms
+        now = pygame.time.get_ticks()
+        lag_ms += min(now - last_tick, MAX_CATCHUP_MS)
+        last_tick = now
+        # 자동 입력(ScriptedPlayer)은 게임 시간으로 예약된 키를 눌린 시각과 함께 넣는다
+        for event in poll_events(round_ms + lag_ms):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            if event.type == pygame.KEYDOWN and not input_completed:
-                if event.key in allowed_keys and len(user_input) < len(target):
-                    user_input.append(event.key)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                toggle_debug_overlay(layer)
+            if event.type == pygame.KEYDOWN and event.key in allowed_keys:
+                pending.append((getattr(event, "pressed_ms", event_time), event.key))
+        while lag_ms >= SIM_STEP_MS:
+            lag_ms -= SIM_STEP_MS
+            round_ms += SIM_STEP_MS
+            # 이 스텝 시각까지 들어온 입력을 먼저 판정한 뒤 시간 초과를 본다
+            while pending and pending[0][0] <= round_ms:
+                pressed_at, key = pending.popleft()
+                if result_at is None and len(user_input) < len(target):
+                    user_input.append(key)
                     if len(user_input) == len(target):
-                        input_completed = True
-                        timer_stopped = True
                         correct_count = sum(1 for i in range(len(target)) if user_input[i] == target[i])
-                        result_show_start = pygame.time.get_ticks()
-        if not input_completed and not timer_stopped and elapsed_time >= time_limit:
-            input_completed = True
-            timer_stopped = True
-            correct_count = 0  # 시간 초과면 무조건 MISS
-            result_show_start = pygame.time.get_ticks()
-        if input_completed:
+                        result_at = pressed_at
+            if result_at is None and round_ms >= time_limit_ms:
+                correct_count = 0  # 시간 초과면 무조건 MISS
+                result_at = time_limit_ms
+        stopped_at = round_ms if result_at is None else result_at
+        remaining_time = max(0, time_limit_ms - stopped_at) / 1000
+        update_end = time.perf_counter()
+
+        # ===== 그리기: 바뀐 부분만 =====
+        # 0.1초 단위로 끊어서 표시 값이 바뀔 때만 문자열을 만들고 다시 그린다
+        tenths = round(remaining_time * 10)
+        if tenths != shown_tenths:
+            shown_tenths = tenths
+            label = f"남은 시간: {tenths / 10:.1f} / {time_limit:.1f} 초"
+            layer.redraw("timer", lambda: draw_text(label, SMALL_FONT, (255, 100, 100), screen, WIDTH // 2, HEIGHT // 4 - 40))
+            if show_debug:
+                layer.redraw("debug", draw_debug_overlay)
+        # 방향 상자는 입력이 들어왔을 때만 다시 그린다
+        if len(user_input) != drawn_inputs:
+            drawn_inputs = len(user_input)
+            layer.redraw("target", lambda: draw_directions(target, user_input, HEIGHT // 4 + 40))
+            layer.redraw("input", lambda: draw_directions(user_input, user_input, HEIGHT // 2 + 110))
+        if result_at is not None and not result_drawn:
+            result_drawn = True
             color = (100, 255, 100) if correct_count == len(target) else (255, 200, 50)
-            draw_text(f"정답 수: {correct_count}/{len(target)}", FONT, color, screen, WIDTH // 2, HEIGHT * 0.8)
-            if result_show_start is not None and pygame.time.get_ticks() - result_show_start > 1200:
-                return correct_count, len(target)
-        pygame.display.flip()
-        clock.tick(60)
+            layer.redraw("result", lambda: draw_text(f"정답 수: {correct_count}/{len(target)}", FONT, color, screen, WIDTH // 2, HEIGHT * 0.8))
+        layer.flush()
+        if frame_stats is not None:
+            frame_stats.record(update_end - frame_start, time.perf_counter() - update_end)
+
+        if result_at is not None and round_ms - result_at > RESULT_SHOW_MS:
+            if frame_stats is not None:
+                frame_stats.results.append((correct_count, len(target)))
+            return correct_count, len(target)
+        clock.tick(FPS)
 
 # RPG 메인 루프
 def main():
@@ -204,23 +482,21 @@ def main():
     hero_hp = 3
     max_hero_hp = 3
     running = True
-    monsound = pygame.mixer.Sound(os.path.join(BASE_DIR, "any_monsterSound.wav"))
-    sword1a = pygame.mixer.Sound(os.path.join(BASE_DIR, "any_swordSound.wav"))
-    monster_die = pygame.mixer.Sound(os.path.join(BASE_DIR, "any_monsterDieSound.wav"))
-    punch = pygame.mixer.Sound(os.path.join(BASE_DIR, "any_punchSound.wav"))
-    die = pygame.mixer.Sound(os.path.join(BASE_DIR, "any_dieSound.wav"))
-    defense = pygame.mixer.Sound(os.path.join(BASE_DIR, "any_defenseSound.mp3"))
+    monsound = load_sound("any_monsterSound.wav")
+    sword1a = load_sound("any_swordSound.wav")
+    monster_die = load_sound("any_monsterDieSound.wav")
+    punch = load_sound("any_punchSound.wav")
+    die = load_sound("any_dieSound.wav")
+    defense = load_sound("any_defenseSound.mp3")
     while running:
         wait_for_start()
         while enemy_hp > 0 and hero_hp > 0:
-            screen.blit(background, (0, 0))
-            screen.blit(hero, hero_pos)
-            screen.blit(monster, monster_pos)
+            screen.blit(get_scene(), (0, 0))
             draw_text(f"Round {round_num}", SMALL_FONT, (0,0,0), screen, 1100, 40)
             draw_hero_hp_bar(hero_hp, max_hero_hp)
             draw_boss_hp_bar(enemy_hp, max_hp)
             pygame.display.flip()
-            pygame.time.wait(800)
+            hold_screen(800)
 
             # 미니게임
             correct, total = direction_mini_game(round_num)
@@ -249,14 +525,12 @@ def main():
             hero_hp -= hero_damage
 
             # 판정 표시
-            screen.blit(background, (0, 0))
-            screen.blit(hero, hero_pos)
-            screen.blit(monster, monster_pos)
+            screen.blit(get_scene(), (0, 0))
             draw_text(result, BIG_FONT, RED if result == "PERFECT!" else (255,200,50), screen, WIDTH // 2, HEIGHT // 2)
             draw_hero_hp_bar(hero_hp, max_hero_hp)
             draw_boss_hp_bar(max(0, enemy_hp), max_hp)
             pygame.display.flip()
-            pygame.time.wait(1200)
+            hold_screen(RESULT_SHOW_MS)
 
             round_num += 1
 
@@ -273,8 +547,9 @@ def main():
         draw_text("다시 하려면 Y, 종료는 N", FONT, WHITE, screen, WIDTH // 2, HEIGHT // 2 + 80)
         pygame.display.flip()
         waiting = True
+        expect_input("end")
         while waiting:
-            for event in pygame.event.get():
+            for event in poll_events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -287,6 +562,8 @@ def main():
                     elif event.key == pygame.K_n:
                         pygame.quit()
                         sys.exit()
+            clock.tick(FPS)
 
 if __name__ == "__main__":
+    init_game()
     main()
@@ -0,0 +1,115 @@
+# nos_crawler.feeds.fetch_many_feeds 를 로컬 HTTP 서버(고정 XML)로 검사
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from nos_crawler import feeds
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+ETAG = '"fixture-v1"'
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    # /rss, /atom: 고정 XML (ETag가 같으면 304) · /slow: 늦게 응답 · /broken: 500
+    routes = {"/rss": "feed_rss.xml", "/atom": "feed_atom.xml", "/slow": "feed_rss.xml"}
+
+    def do_GET(self):
+        self.server.log.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/broken":
+            self.send_error(500)
+            return
+        if self.path not in self.routes:
+            self.send_error(404)
+            return
+        if self.path == "/slow":
+            time.sleep(0.2)
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        body = read_fixture(self.routes[self.path])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    httpd.log = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def feed_cache_dir(tmp_path, monkeypatch):
+    # 저장소의 .feed_cache 대신 테스트마다 빈 디렉터리 사용
+    monkeypatch.setattr(feeds, "FEED_CACHE_DIR", str(tmp_path / "feed_cache"))
+
+
+def test_merges_in_feed_order_and_dedups_by_url_and_guid(server):
+    _, base = server
+    merged, stats = feeds.fetch_many_feeds({"Algemeen": f"{base}/rss", "Binnenland": f"{base}/atom"}, count=3)
+
+    # Atom의 storm 기사는 URL이, bibliotheek 기사는 GUID가 RSS 항목과 같아 빠진다
+    assert [item["url"] for item in merged] == [
+        "https://nos.nl/artikel/1001-begroting",
+        "https://nos.nl/artikel/1002-storm",
+        "https://nos.nl/artikel/1003-beker",
+        "https://nos.nl/artikel/2002-treinen",
+    ]
+    assert [item["feed"] for item in merged] == ["Algemeen"] * 3 + ["Binnenland"]
+    assert all(item["variants"] == [] for item in merged)
+    assert [(s["feed"], s["items"], s["new"], s["error"]) for s in stats] == [
+        ("Algemeen", 3, 3, None),
+        ("Binnenland", 3, 1, None),
+    ]
+
+
+def test_reports_error_and_latency_per_feed(server):
+    _, base = server
+    merged, stats = feeds.fetch_many_feeds(
+        {"Kapot": f"{base}/broken", "Traag": f"{base}/slow", "Binnenland": f"{base}/atom"}, count=3,
+    )
+    by_feed = {s["feed"]: s for s in stats}
+
+    assert "500" in by_feed["Kapot"]["error"]
+    assert by_feed["Kapot"]["items"] == 0
+    assert by_feed["Traag"]["error"] is None
+    assert by_feed["Traag"]["latency_ms"] >= 200
+    assert by_feed["Binnenland"]["latency_ms"] < by_feed["Traag"]["latency_ms"]
+    # 실패한 피드가 있어도 나머지는 합쳐진다 (RSS 3개 + Atom에서 새로 나온 1개)
+    assert len(merged) == 4
+
+
+def test_unchanged_feed_is_served_from_cache_on_304(server, monkeypatch):
+    httpd, base = server
+    first, _ = feeds.fetch_many_feeds({"Algemeen": f"{base}/rss"}, count=3)
+
+    # 304면 본문을 다시 파싱하지도, 키워드를 다시 뽑지도 않아야 한다
+    def fail(*args, **kwargs):
+        raise AssertionError("304 응답인데 항목을 다시 처리함")
+    monkeypatch.setattr(feeds, "process_entries", fail)
+    second, stats = feeds.fetch_many_feeds({"Algemeen": f"{base}/rss"}, count=3)
+
+    assert httpd.log == [("/rss", None), ("/rss", ETAG)]
+    assert stats[0]["error"] is None
+    assert second == first